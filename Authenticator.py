@@ -4,23 +4,35 @@ from platformdirs import user_documents_dir
 from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM_1024
 import hashlib
 import base64
+import sys
 from dilithium_py.ml_dsa import ML_DSA_44
+from ml_dsa_context import Verifier
+from keystore import KeyStore, DEFAULT_PATH, KIND_SIG_PUBLIC
 
 def keyLoad(filename):
     with open(filename, "rb") as f:
         return f.read()
 
-pk = keyLoad("verificationKey.bin")
-digitalSignature = keyLoad("digitalSignature.bin")
+if __name__ == "__main__":
+    try:
+        with KeyStore(DEFAULT_PATH, readonly=True) as store:
+            entry = store.latest(KIND_SIG_PUBLIC)
+    except FileNotFoundError:
+        entry = None
+    if entry is None:
+        sys.exit(f"No verification key in {DEFAULT_PATH}, run Signer.py first")
+    pk = entry.data
+    digitalSignature = keyLoad("digitalSignature.bin")
 
-path = r'C:\Users\vboxuser\Documents\prueba.txt'
+    path = r'C:\Users\vboxuser\Documents\prueba.txt'
 
-file = open(path,"rb")
-hasher = hashlib.sha256()
-data = file.read()
-hasher.update(data)
-hash = hasher.digest()
-file.close()
+    file = open(path,"rb")
+    hasher = hashlib.sha256()
+    data = file.read()
+    hasher.update(data)
+    hash = hasher.digest()
+    file.close()
 
-is_valid = ML_DSA_44.verify(pk, hash, digitalSignature)  # verify(public_key, message_bytes, signature)
-print("Validity: ", is_valid)
\ No newline at end of file
+    verifier = Verifier(pk)  # Decodes pk and expands the public matrix once, reusable for more signatures
+    is_valid = verifier.verify(hash, digitalSignature)  # verify(message_bytes, signature)
+    print("Validity: ", is_valid)
\ No newline at end of file
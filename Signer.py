@@ -5,24 +5,24 @@ from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM_1024
 import hashlib
 import base64
 from dilithium_py.ml_dsa import ML_DSA_44
+from keystore import KeyStore, DEFAULT_PATH, KIND_SIG_PUBLIC
 
-path = r'C:\Users\vboxuser\Documents\prueba.txt'
+if __name__ == "__main__":
+    path = r'C:\Users\vboxuser\Documents\prueba.txt'
 
-file = open(path,"rb")
-hasher = hashlib.sha256()
-data = file.read()
-hasher.update(data)
-hash = hasher.digest()
-file.close()
+    file = open(path,"rb")
+    hasher = hashlib.sha256()
+    data = file.read()
+    hasher.update(data)
+    hash = hasher.digest()
+    file.close()
 
-pk, sk = ML_DSA_44.keygen() # public key, secret(private)key
-digitalSignature = ML_DSA_44.sign(sk, hash)   # Uses the private key to encrypt the hash using sign(secret_key, message_bytes(the hash))
+    pk, sk = ML_DSA_44.keygen() # public key, secret(private)key
+    digitalSignature = ML_DSA_44.sign(sk, hash)   # Uses the private key to encrypt the hash using sign(secret_key, message_bytes(the hash))
 
-file = open("verificationKey.bin", "wb")
-file.write(pk)  
-file.close()
-
-file = open("digitalSignature.bin", "wb")
-file.write(digitalSignature)  
-file.close()
+    with KeyStore(DEFAULT_PATH) as store:
+        store.put(KIND_SIG_PUBLIC, pk)
 
+    file = open("digitalSignature.bin", "wb")
+    file.write(digitalSignature)  
+    file.close()
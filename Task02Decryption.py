@@ -1,17 +1,19 @@
 from cryptography.fernet import Fernet
 import os
+import sys
 from platformdirs import user_documents_dir
+from keystore import KeyStore, DEFAULT_PATH, KIND_SYMMETRIC
 
 def lastKeyLoad(filename):
-    with open(filename, "rb") as f:
-        lines = f.read().strip().split(b"\n")  # Read all lines as bytes and split by newline
-        if lines:
-            return lines[-1]  # Return the last line (last key)
+    if not os.path.exists(filename):
+        return None  # No key store yet
+    with KeyStore(filename, readonly=True) as store:
+        entry = store.latest(KIND_SYMMETRIC)  # Read from the index, without going through the file
+        if entry:
+            return entry.data  # Return the last key
         else:
             return None  # No keys found
- 
-key = lastKeyLoad("keylog.txt")
-folderpath = user_documents_dir()
+
 
 def decryption(key, folderpath):
     f = Fernet(key)
@@ -33,4 +35,9 @@ def decryption(key, folderpath):
         elif os.path.isdir(currentPath):
             decryption(key,currentPath)
 
-decryption(key,folderpath)
\ No newline at end of file
+if __name__ == "__main__":
+    key = lastKeyLoad(DEFAULT_PATH)
+    if key is None:
+        sys.exit(f"No key in {DEFAULT_PATH}, run Task02Encryption.py first")
+    folderpath = user_documents_dir()
+    decryption(key,folderpath)
\ No newline at end of file
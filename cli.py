@@ -0,0 +1,441 @@
+"""
+Unified command line entry point for the project.
+
+Usage:
+    python -m cli kem keygen|encaps|decaps|params
+    python -m cli sign FILE
+    python -m cli verify FILE [FILE ...]
+    python -m cli hamming encode|decode
+    python -m cli keys list|import|export
+    python -m cli bench kem|keygen|mldsa|startup
+
+Heavy dependencies (numpy, dilithium_py, the McEliece KEM) are imported inside
+the command that needs them, so --help, `kem params` and `hamming` only pay
+for the interpreter and argparse. Use --timing to print the time spent before
+the command starts and the time the command itself took.
+"""
+
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import hashlib
+import os
+import sys
+
+from keystore import DEFAULT_PATH, KINDS  # standard library only, cheap to import
+
+# Must match ML_MCELIECE_1024 in mceliece_kem.py (kept here so that querying
+# the parameters does not import numpy)
+KEM_N = 192
+KEM_K = 128
+KEM_T = 8
+SHARED_SECRET_BYTES = 32
+# Must match PARAMETER_SETS in mceliece_kem.py
+MCELIECE_PARAMETER_SETS = ["mceliece348864", "mceliece460896", "mceliece6688128", "mceliece6960119", "mceliece8192128"]
+
+# Extra milliseconds over a bare `python -c pass` allowed for the lightweight
+# commands (checked by `bench startup`)
+STARTUP_BUDGET_MS = 50
+LIGHTWEIGHT_COMMANDS = [
+    ["--help"],
+    ["kem", "params"],
+    ["hamming", "encode", "Contraseña"],
+]
+HEAVY_MODULES = ["numpy", "dilithium_py", "cryptography", "platformdirs", "mceliece_kem"]
+
+
+def keyLoad(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def keySave(filename, data):
+    with open(filename, "wb") as f:
+        f.write(data)
+
+
+def fileHash(filename):
+    # Signatures are made over the SHA-256 of the file, as in Signer.py
+    hasher = hashlib.sha256()
+    with open(filename, "rb") as f:
+        hasher.update(f.read())
+    return hasher.digest()
+
+
+# KEM commands
+
+def cmdKemParams(args):
+    print(f"McEliece KEM: n={KEM_N}, k={KEM_K}, t={KEM_T}")
+    print(f"   Public matrix G: {KEM_K}x{KEM_N} bits")
+    print(f"   Ciphertext size: {KEM_N} bytes")
+    print(f"   Shared secret size: {SHARED_SECRET_BYTES} bytes")
+
+
+def latestKey(args, kind):
+    # Latest key of a kind in the key store, or None (also when there is no store)
+    from keystore import KeyStore
+    try:
+        with KeyStore(args.store, readonly=True) as store:
+            return store.latest(kind)
+    except FileNotFoundError:
+        return None
+
+
+def kemInput(args, filename, kind, what):
+    if filename:
+        return keyLoad(filename)
+    entry = latestKey(args, kind)
+    if entry is None:
+        sys.exit(f"kem {args.kemCommand}: no {what} in {args.store}")
+    return entry.data
+
+
+def kemOutput(args, outputs):
+    # outputs: (description, kind, data, file); keys without a file go to the key store in one commit,
+    # data None means the key is already written to its file
+    from keystore import KeyStore
+    stored = [(kind, data) for _, kind, data, filename in outputs if not filename]
+    if stored:
+        with KeyStore(args.store) as store:
+            fingerprints = iter(store.put_many(stored))
+    for description, kind, data, filename in outputs:
+        if filename:
+            if data is not None:
+                keySave(filename, data)
+            print(f"{description} -> {filename}")
+        else:
+            print(f"{description} {next(fingerprints).hex()[:16]} -> {args.store}")
+
+
+def cmdKemKeygen(args):
+    from keystore import KIND_KEM_PUBLIC, KIND_KEM_PRIVATE
+    if args.params or args.packed:
+        # Block-wise keygen, keys written straight to their files in packed form
+        # (or to memory when they go to the key store)
+        from mceliece_kem import McEliece_KEM, PARAMETER_SETS, packed_key_size
+        n, k, t = PARAMETER_SETS[args.params] if args.params else (KEM_N, KEM_K, KEM_T)
+        publicKey = args.pk or bytearray(packed_key_size(n, k))
+        privateKey = args.sk or bytearray(packed_key_size(n, k))
+        size = McEliece_KEM(n=n, k=k, t=t).keygen_packed(publicKey, privateKey, args.memory_budget * 2**20)
+        kemOutput(args, [(f"Packed public key ({size} bytes)", KIND_KEM_PUBLIC, None if args.pk else publicKey, args.pk),
+                         (f"Packed private key ({size} bytes)", KIND_KEM_PRIVATE, None if args.sk else privateKey, args.sk)])
+        return
+    from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM
+    publicKey, privateKey = ML_KEM.keygen()
+    kemOutput(args, [(f"Public key ({len(publicKey)} bytes)", KIND_KEM_PUBLIC, publicKey, args.pk),
+                     (f"Private key ({len(privateKey)} bytes)", KIND_KEM_PRIVATE, privateKey, args.sk)])
+
+
+def cmdKemEncaps(args):
+    from keystore import KIND_KEM_PUBLIC, KIND_KEM_CIPHERTEXT
+    from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM
+    sharedSecret, ciphertext = ML_KEM.encaps(kemInput(args, args.pk, KIND_KEM_PUBLIC, "public key"))
+    kemOutput(args, [(f"Ciphertext ({len(ciphertext)} bytes)", KIND_KEM_CIPHERTEXT, ciphertext, args.ct)])
+    print(sharedSecret.hex())
+
+
+def cmdKemDecaps(args):
+    from keystore import KIND_KEM_PRIVATE, KIND_KEM_CIPHERTEXT
+    from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM
+    privateKey = kemInput(args, args.sk, KIND_KEM_PRIVATE, "private key")
+    ciphertext = kemInput(args, args.ct, KIND_KEM_CIPHERTEXT, "ciphertext")
+    sharedSecret = ML_KEM.decaps(privateKey, ciphertext)
+    print(sharedSecret.hex())
+
+
+# Signature commands
+
+def cmdSign(args):
+    from ml_dsa_context import Signer
+    if args.sk:
+        sk = keyLoad(args.sk)
+    else:
+        # Same as Signer.py: fresh key pair, verification key kept in the key store
+        from dilithium_py.ml_dsa import ML_DSA_44
+        from keystore import KeyStore, KIND_SIG_PUBLIC
+        pk, sk = ML_DSA_44.keygen()
+        if args.vk:
+            keySave(args.vk, pk)
+            print(f"Verification key -> {args.vk}")
+        else:
+            with KeyStore(args.store) as store:
+                fp = store.put(KIND_SIG_PUBLIC, pk)
+            print(f"Verification key {fp.hex()[:16]} -> {args.store}")
+    digitalSignature = Signer(sk).sign(fileHash(args.file))
+    keySave(args.out, digitalSignature)
+    print(f"Signature ({len(digitalSignature)} bytes) -> {args.out}")
+
+
+def cmdVerify(args):
+    from ml_dsa_context import Verifier
+    if len(args.sig) != len(args.files):
+        sys.exit("verify: give one --sig per file")
+    if args.vk:
+        pk = keyLoad(args.vk)
+    else:
+        from keystore import KIND_SIG_PUBLIC
+        entry = latestKey(args, KIND_SIG_PUBLIC)
+        if entry is None:
+            sys.exit(f"verify: no verification key in {args.store}")
+        pk = entry.data
+    verifier = Verifier(pk)
+    results = verifier.verify_many((fileHash(f), keyLoad(s)) for f, s in zip(args.files, args.sig))
+    for filename, valid in zip(args.files, results):
+        print(f"{filename}: {'valid' if valid else 'INVALID'}")
+    if not all(results):
+        sys.exit(1)
+
+
+# Hamming commands
+
+def cmdHammingEncode(args):
+    import random
+    from Task05 import encodeMessage
+    blocks = encodeMessage(args.text)
+    if args.noise:
+        for block in blocks:
+            block[random.randrange(15)] ^= 1 # one error per block, still correctable
+    print(" ".join("".join(map(str, block)) for block in blocks))
+
+
+def cmdHammingDecode(args):
+    from Task05 import decodeMessage
+    bits = "".join(args.bits).replace(" ", "")
+    if len(bits) % 15 or set(bits) - {"0", "1"}:
+        sys.exit("hamming decode: input must be a sequence of 15 bit blocks")
+    blocks = [list(map(int, bits[i:i+15])) for i in range(0, len(bits), 15)]
+    print(decodeMessage(blocks, args.length))
+
+
+# Key store commands
+
+def findKey(store, prefix):
+    # Full fingerprint from the index, or a unique prefix as printed by `keys list` (scans the store)
+    prefix = prefix.lower()
+    if not prefix or any(c not in "0123456789abcdef" for c in prefix) or len(prefix) > 64:
+        sys.exit(f"keys export: invalid fingerprint {prefix!r}, expected hexadecimal")
+    if len(prefix) == 64:
+        return store.get(bytes.fromhex(prefix))
+    matches = [entry for entry in store if entry.fingerprint.hex().startswith(prefix)]
+    if len(matches) > 1:
+        sys.exit(f"keys export: fingerprint {prefix} matches {len(matches)} keys, give more digits")
+    return matches[0] if matches else None
+
+
+def cmdKeysList(args):
+    from datetime import datetime
+    from keystore import KeyStore
+    names = {value: name for name, value in KINDS.items()}
+    if not os.path.exists(args.store):
+        sys.exit(f"keys list: no key store at {args.store}")
+    with KeyStore(args.store, readonly=True) as store:
+        for entry in store:
+            if args.kind and entry.kind != KINDS[args.kind]:
+                continue
+            created = datetime.fromtimestamp(entry.created / 1e9).isoformat(sep=" ", timespec="seconds")
+            print(f"{entry.fingerprint.hex()[:16]}  {created}  {names.get(entry.kind, entry.kind):14s} {len(entry.data):7d} bytes")
+
+
+def cmdKeysImport(args):
+    from keystore import KeyStore
+    data = keyLoad(args.file)
+    # keylog.txt holds one Fernet key per line
+    keys = [line.strip() for line in data.split(b"\n") if line.strip()] if args.lines else [data]
+    with KeyStore(args.store) as store:
+        # One commit: either every key is imported or none is
+        try:
+            store.put_many([(KINDS[args.kind], key) for key in keys])
+        except ValueError as e:
+            sys.exit(f"keys import: {args.file}: {e}")
+        print(f"{len(keys)} key(s) from {args.file} -> {args.store} ({len(store)} in store)")
+
+
+def cmdKeysExport(args):
+    from keystore import KeyStore
+    if not os.path.exists(args.store):
+        sys.exit(f"keys export: no key store at {args.store}")
+    with KeyStore(args.store, readonly=True) as store:
+        if args.fingerprint:
+            entry = findKey(store, args.fingerprint)
+        else:
+            entry = store.latest(KINDS[args.kind] if args.kind else None)
+    if entry is None:
+        sys.exit("keys export: key not found")
+    if args.out:
+        keySave(args.out, entry.data)
+    else:
+        sys.stdout.buffer.write(entry.data)
+
+
+# Benchmarks
+
+def cmdBenchKem(args):
+    from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM
+    timings = {'keygen': 0.0, 'encaps': 0.0, 'decaps': 0.0}
+    failures = 0
+    for _ in range(args.n):
+        start = time.perf_counter()
+        pk, sk = ML_KEM.keygen()
+        timings['keygen'] += time.perf_counter() - start
+        start = time.perf_counter()
+        secret1, ct = ML_KEM.encaps(pk)
+        timings['encaps'] += time.perf_counter() - start
+        start = time.perf_counter()
+        secret2 = ML_KEM.decaps(sk, ct)
+        timings['decaps'] += time.perf_counter() - start
+        failures += secret1 != secret2
+    print(f"McEliece KEM (n={KEM_N}, k={KEM_K}, t={KEM_T}), {args.n} cycles")
+    for op, elapsed in timings.items():
+        print(f"   {op:6s}: {1000 * elapsed / args.n:8.3f} ms/op")
+    print(f"   failures: {failures}/{args.n}")
+
+
+def cmdBenchKeygen(args):
+    from mceliece_kem import benchmark_keygen, print_keygen_benchmark
+    print_keygen_benchmark(benchmark_keygen(args.params, args.memory_budget * 2**20, dense=args.dense))
+
+
+def cmdBenchMldsa(args):
+    from ml_dsa_context import benchmark, print_benchmark
+    print_benchmark(benchmark(args.n))
+
+
+def _wallTime(argv, n, cwd):
+    # Best of n runs of a fresh interpreter, in milliseconds
+    import subprocess
+    best = None
+    for _ in range(n):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        elapsed = 1000 * (time.perf_counter() - start)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def cmdBenchStartup(args):
+    import os
+    import subprocess
+    here = os.path.dirname(os.path.abspath(__file__))
+    python = [sys.executable, "-c", "pass"]
+    base = _wallTime(python, args.n, here)
+    print(f"Interpreter only: {base:7.1f} ms (best of {args.n})")
+    print(f"Budget over interpreter for lightweight commands: {STARTUP_BUDGET_MS} ms")
+    overBudget = False
+    for command in LIGHTWEIGHT_COMMANDS:
+        argv = [sys.executable, "-m", "cli"] + command
+        elapsed = _wallTime(argv, args.n, here) - base
+        ok = elapsed <= STARTUP_BUDGET_MS
+        overBudget |= not ok
+        print(f"   {' '.join(command):30s} +{elapsed:6.1f} ms  {'ok' if ok else 'OVER BUDGET'}")
+
+    # Heavy modules must not be imported by the lightweight commands
+    check = ("import sys, cli; cli.main({!r}); "
+             "print('imported:', *[m for m in {!r} if m in sys.modules])")
+    for command in LIGHTWEIGHT_COMMANDS[1:]:
+        out = subprocess.run([sys.executable, "-c", check.format(command, HEAVY_MODULES)],
+                             cwd=here, check=True, capture_output=True, text=True).stdout.splitlines()
+        leaked = out[-1].split()[1:]
+        if leaked:
+            overBudget = True
+            print(f"   {' '.join(command)} imported: {' '.join(leaked)}")
+    if overBudget:
+        sys.exit(1)
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Post-quantum cryptography project tools")
+    parser.add_argument("--timing", action="store_true", help="print startup and command time to stderr")
+    parser.add_argument("--store", default=DEFAULT_PATH, help="key store file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    kem = commands.add_parser("kem", help="McEliece key encapsulation").add_subparsers(dest="kemCommand", required=True)
+    p = kem.add_parser("params", help="show the parameters and sizes")
+    p.set_defaults(func=cmdKemParams)
+    p = kem.add_parser("keygen", help="generate a key pair")
+    p.add_argument("--pk", help="public key output file (default: key store)")
+    p.add_argument("--sk", help="private key output file (default: key store)")
+    p.add_argument("--params", choices=MCELIECE_PARAMETER_SETS, help="Classic McEliece parameter set (implies --packed)")
+    p.add_argument("--packed", action="store_true", help="packed key format, generated in blocks")
+    p.add_argument("--memory-budget", type=int, default=16, help="working memory in MB for --packed")
+    p.set_defaults(func=cmdKemKeygen)
+    p = kem.add_parser("encaps", help="create a shared secret and its ciphertext")
+    p.add_argument("--pk", help="public key file (default: latest one in the key store)")
+    p.add_argument("--ct", help="ciphertext output file (default: key store)")
+    p.set_defaults(func=cmdKemEncaps)
+    p = kem.add_parser("decaps", help="recover the shared secret from a ciphertext")
+    p.add_argument("--sk", help="private key file (default: latest one in the key store)")
+    p.add_argument("--ct", help="ciphertext file (default: latest one in the key store)")
+    p.set_defaults(func=cmdKemDecaps)
+
+    p = commands.add_parser("sign", help="sign the SHA-256 of a file with ML-DSA-44")
+    p.add_argument("file")
+    p.add_argument("--sk", help="signing key file (default: generate a new key pair)")
+    p.add_argument("--vk", help="verification key output file for a new key pair (default: key store)")
+    p.add_argument("--out", default="digitalSignature.bin", help="signature output file")
+    p.set_defaults(func=cmdSign)
+
+    p = commands.add_parser("verify", help="verify ML-DSA-44 signatures of files against one key")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--vk", help="verification key file (default: latest one in the key store)")
+    p.add_argument("--sig", action="append", help="signature file, once per file (default: digitalSignature.bin)")
+    p.set_defaults(func=cmdVerify)
+
+    hamming = commands.add_parser("hamming", help="Hamming(15,11) codec").add_subparsers(dest="hammingCommand", required=True)
+    p = hamming.add_parser("encode", help="encode a text into 15 bit blocks")
+    p.add_argument("text")
+    p.add_argument("--noise", action="store_true", help="flip one random bit in each block")
+    p.set_defaults(func=cmdHammingEncode)
+    p = hamming.add_parser("decode", help="decode 15 bit blocks (correcting one error per block)")
+    p.add_argument("bits", nargs="+")
+    p.add_argument("--length", type=int, help="number of characters (exact, keeps trailing NUL characters)")
+    p.set_defaults(func=cmdHammingDecode)
+
+    keys = commands.add_parser("keys", help="key store").add_subparsers(dest="keysCommand", required=True)
+    p = keys.add_parser("list", help="list the keys in the store")
+    p.add_argument("--kind", choices=list(KINDS))
+    p.set_defaults(func=cmdKeysList)
+    p = keys.add_parser("import", help="add a key file (e.g. verificationKey.bin) to the store")
+    p.add_argument("file")
+    p.add_argument("--kind", choices=list(KINDS), required=True)
+    p.add_argument("--lines", action="store_true", help="one key per line, as in keylog.txt")
+    p.set_defaults(func=cmdKeysImport)
+    p = keys.add_parser("export", help="write a key from the store (default: the latest one)")
+    p.add_argument("--kind", choices=list(KINDS))
+    p.add_argument("--fingerprint", help="fingerprint in hex, or a unique prefix of it as shown by keys list")
+    p.add_argument("-o", "--out", help="output file (default: stdout)")
+    p.set_defaults(func=cmdKeysExport)
+
+    bench = commands.add_parser("bench", help="benchmarks").add_subparsers(dest="benchCommand", required=True)
+    p = bench.add_parser("kem", help="McEliece keygen/encaps/decaps")
+    p.add_argument("-n", type=int, default=10, help="number of cycles")
+    p.set_defaults(func=cmdBenchKem)
+    p = bench.add_parser("keygen", help="peak memory and time of keygen per parameter set")
+    p.add_argument("--params", nargs="+", choices=MCELIECE_PARAMETER_SETS, help="default: all")
+    p.add_argument("--memory-budget", type=int, default=16, help="working memory in MB of the packed keygen")
+    p.add_argument("--dense", action="store_true", help="also measure the original (dense) keygen, slow and memory hungry")
+    p.set_defaults(func=cmdBenchKeygen)
+    p = bench.add_parser("mldsa", help="ML-DSA stateless calls vs prepared contexts")
+    p.add_argument("-n", type=int, default=50, help="number of messages")
+    p.set_defaults(func=cmdBenchMldsa)
+    p = bench.add_parser("startup", help="cold-start time of the lightweight commands")
+    p.add_argument("-n", type=int, default=5, help="runs per command (best is kept)")
+    p.set_defaults(func=cmdBenchStartup)
+
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    if args.command == "verify" and not args.sig:
+        args.sig = ["digitalSignature.bin"]
+    ready = time.perf_counter()
+    args.func(args)
+    if args.timing:
+        done = time.perf_counter()
+        print(f"startup: {1000 * (ready - _T0):.1f} ms, command: {1000 * (done - ready):.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
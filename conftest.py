@@ -0,0 +1,21 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench", action="store_true",
+                     help="run the performance regression tests (marked 'bench')")
+    parser.addoption("--update-baseline", action="store_true",
+                     help="store the measured timings as the new benchmark baseline (implies --bench)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "bench: performance regression test, only run with --bench")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--bench") or config.getoption("--update-baseline"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --bench")
+    for item in items:
+        if "bench" in item.keywords:
+            item.add_marker(skip)
@@ -4,10 +4,8 @@ from platformdirs import user_documents_dir
 from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM_1024
 import hashlib
 import base64
-
-def keyLoad(filename):
-    with open(filename, "rb") as f:
-        return f.read()
+import sys
+from keystore import KeyStore, DEFAULT_PATH, KIND_KEM_PRIVATE, KIND_KEM_CIPHERTEXT
 
 def decryption(password, folderpath):
     # 1. Generation of K2 with password
@@ -19,11 +17,23 @@ def decryption(password, folderpath):
     K2 = base64.urlsafe_b64encode(key)
 
     # 2. Reading and decryption of private Key (with K2)
+    try:
+        with KeyStore(DEFAULT_PATH, readonly=True) as store:
+            privateEntry = store.latest(KIND_KEM_PRIVATE)
+            # The K1 encapsulated for this private key was stored with it
+            encapEntry = store.after(privateEntry.created, KIND_KEM_CIPHERTEXT) if privateEntry else None
+    except FileNotFoundError:
+        privateEntry = encapEntry = None
+    if privateEntry is None:
+        sys.exit(f"No private key in {DEFAULT_PATH}, run encryption.py first")
+    if encapEntry is None or encapEntry.created != privateEntry.created:
+        sys.exit(f"No encapsulated K1 stored with the latest private key in {DEFAULT_PATH}")
+    privateKey = privateEntry.data
+    encapK1 = encapEntry.data
     f2 = Fernet(K2)
-    privateKey = f2.decrypt(keyLoad("privateKey.bin"))
+    privateKey = f2.decrypt(privateKey)
 
     # 3. Reading and decryption of K1 (with private Key)
-    encapK1 = keyLoad("encapK1.bin")
     K1 = ML_KEM_1024.decaps(privateKey, encapK1)
     K1 = base64.urlsafe_b64encode(K1)
     # 4. Call to auxDecryption to recursively decrypt
@@ -49,6 +59,7 @@ def auxDecryption(key, folderpath):
         elif os.path.isdir(currentPath):
             auxDecryption(key,currentPath)
 
-folderpath = user_documents_dir()
-password = b"potato"
-decryption(password,folderpath)
\ No newline at end of file
+if __name__ == "__main__":
+    folderpath = user_documents_dir()
+    password = b"potato"
+    decryption(password,folderpath)
\ No newline at end of file
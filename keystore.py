@@ -0,0 +1,419 @@
+"""
+Indexed key store: one file holding every key of the project.
+
+Replaces the append-only keylog.txt and the loose privateKey.bin, encapK1.bin
+and verificationKey.bin files. KEM, signature and symmetric keys live side by
+side and are found without scanning the file, so lookups cost the same with ten
+keys or with millions.
+
+File layout (little endian):
+- Header (HEADER_SIZE bytes at offset 0): counters, position of the two index
+  regions and the latest entry of each kind
+- Entry table: ENTRY_SIZE-byte entries in creation order
+  (fingerprint, creation time, data offset, data length, kind)
+- Slot table: open addressing hash table (linear probing) from the fingerprint
+  to the entry number, twice as many slots as entries fit in the entry table
+- Key data: raw bytes, appended
+
+When the entry table is full both tables are copied to the end of the file with
+double capacity, so growing costs O(1) amortized per key.
+
+Appends are atomic: data, entry and slot are written past the committed part
+of the file and flushed first, and the key only becomes visible when the header
+(a single write) is updated. A crash before that leaves the store as it was.
+Keys stored with put_many() are committed together in the same way.
+Reads use mmap: latest key O(1), key by fingerprint O(1), key by creation time
+O(log n) (binary search over the entry table).
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+DEFAULT_PATH = "keystore.pqks"
+MAGIC = b"PQKS"
+VERSION = 1
+
+# Kinds of key material
+KIND_SYMMETRIC = 1      # Fernet keys (Task02)
+KIND_KEM_PUBLIC = 2
+KIND_KEM_PRIVATE = 3    # encryption.py stores it encrypted with K2
+KIND_KEM_CIPHERTEXT = 4 # encapsulated K1
+KIND_SIG_PUBLIC = 5     # ML-DSA verification key
+KIND_SIG_PRIVATE = 6
+MAX_KINDS = 16
+
+KINDS = {
+    'symmetric': KIND_SYMMETRIC,
+    'kem-public': KIND_KEM_PUBLIC,
+    'kem-private': KIND_KEM_PRIVATE,
+    'kem-ciphertext': KIND_KEM_CIPHERTEXT,
+    'sig-public': KIND_SIG_PUBLIC,
+    'sig-private': KIND_SIG_PRIVATE,
+}
+
+# magic, version, count, end, entry_off, entry_cap, slot_off, slot_cap, latest[MAX_KINDS]
+_HEADER = struct.Struct(f"<4sIQQQQQQ{MAX_KINDS}Q")
+HEADER_SIZE = 256
+# fingerprint, created (ns), offset, length, kind
+_ENTRY = struct.Struct("<32sqQIB3x")
+ENTRY_SIZE = _ENTRY.size
+_SLOT = struct.Struct("<Q")
+SLOT_SIZE = _SLOT.size
+
+INITIAL_CAPACITY = 64
+
+KeyEntry = namedtuple('KeyEntry', ['fingerprint', 'kind', 'created', 'data'])
+
+
+def fingerprint(data: bytes) -> bytes:
+    """
+    SHA-256 of the key bytes, used as its identifier in the store
+    """
+    return hashlib.sha256(data).digest()
+
+
+class KeyStore:
+    """
+    Single-file key store with an on-disk index
+
+    Usage:
+        with KeyStore("keystore.pqks") as store:
+            fp = store.put(KIND_SIG_PUBLIC, pk)
+            pk = store.latest(KIND_SIG_PUBLIC).data
+            pk = store.get(fp).data
+
+    Only one process should write to a store at a time. Readers open it with
+    readonly=True, which raises FileNotFoundError instead of creating an empty
+    store when the file is missing.
+    """
+
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        if not readonly and (not os.path.exists(path) or os.path.getsize(path) == 0):
+            self._create()
+        self._file = open(path, "rb" if readonly else "r+b")
+        self._mm = None
+        if os.path.getsize(path) < HEADER_SIZE:
+            self._file.close()
+            raise ValueError(f"{path} is not a key store")
+        header = self._read_header()
+        if header['magic'] != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a key store")
+        if header['version'] != VERSION:
+            self._file.close()
+            raise ValueError(f"Unsupported key store version {header['version']}")
+
+    def _create(self):
+        # Empty store: header followed by both (empty) tables
+        entry_off = HEADER_SIZE
+        slot_off = entry_off + INITIAL_CAPACITY * ENTRY_SIZE
+        end = slot_off + 2 * INITIAL_CAPACITY * SLOT_SIZE
+        header = {
+            'magic': MAGIC, 'version': VERSION, 'count': 0, 'end': end,
+            'entry_off': entry_off, 'entry_cap': INITIAL_CAPACITY,
+            'slot_off': slot_off, 'slot_cap': 2 * INITIAL_CAPACITY,
+            'latest': [0] * MAX_KINDS,
+        }
+        with open(self.path, "wb") as f:
+            f.write(self._pack_header(header))
+            f.write(bytes(end - HEADER_SIZE))
+            f.flush()
+            os.fsync(f.fileno())
+
+    # Header
+
+    @staticmethod
+    def _pack_header(header: dict) -> bytes:
+        packed = _HEADER.pack(
+            header['magic'], header['version'], header['count'], header['end'],
+            header['entry_off'], header['entry_cap'], header['slot_off'], header['slot_cap'],
+            *header['latest'])
+        return packed.ljust(HEADER_SIZE, b"\0")
+
+    @staticmethod
+    def _unpack_header(buffer) -> dict:
+        fields = _HEADER.unpack_from(buffer, 0)
+        return {
+            'magic': fields[0], 'version': fields[1], 'count': fields[2], 'end': fields[3],
+            'entry_off': fields[4], 'entry_cap': fields[5],
+            'slot_off': fields[6], 'slot_cap': fields[7],
+            'latest': list(fields[8:]),
+        }
+
+    def _read_header(self) -> dict:
+        self._file.seek(0)
+        return self._unpack_header(self._file.read(HEADER_SIZE))
+
+    # Reading (mmap)
+
+    def _view(self):
+        """
+        Return the mmap of the file and its header, remapping if the store grew
+        """
+        if self._mm is not None:
+            header = self._unpack_header(self._mm)
+            if header['end'] <= len(self._mm):
+                return self._mm, header
+            self._mm.close()
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm, self._unpack_header(self._mm)
+
+    def _entry(self, mm, header: dict, index: int) -> KeyEntry:
+        fp, created, offset, length, kind = _ENTRY.unpack_from(mm, header['entry_off'] + index * ENTRY_SIZE)
+        return KeyEntry(fp, kind, created, bytes(mm[offset:offset + length]))
+
+    @staticmethod
+    def _entry_kind(mm, header: dict, index: int) -> int:
+        return _ENTRY.unpack_from(mm, header['entry_off'] + index * ENTRY_SIZE)[4]
+
+    def _find(self, mm, header: dict, fp: bytes):
+        """
+        Entry number of fingerprint fp, or None
+        """
+        mask = header['slot_cap'] - 1
+        slot = int.from_bytes(fp[:8], "little") & mask
+        while True:
+            (value,) = _SLOT.unpack_from(mm, header['slot_off'] + slot * SLOT_SIZE)
+            if value == 0:
+                return None
+            index = value - 1
+            # Slots left by an interrupted append point past count and are skipped
+            position = header['entry_off'] + index * ENTRY_SIZE
+            if index < header['count'] and mm[position:position + 32] == fp:
+                return index
+            slot = (slot + 1) & mask
+
+    def __len__(self) -> int:
+        return self._view()[1]['count']
+
+    def latest(self, kind: int = None):
+        """
+        Most recent key, of the given kind if one is given
+
+        Returns:
+            KeyEntry, or None if the store has no such key
+        """
+        mm, header = self._view()
+        if kind is None:
+            index = header['count'] - 1
+        else:
+            index = header['latest'][kind] - 1
+        if index < 0:
+            return None
+        return self._entry(mm, header, index)
+
+    def get(self, fp: bytes):
+        """
+        Key with fingerprint fp
+
+        Returns:
+            KeyEntry, or None if the store does not hold that key
+        """
+        mm, header = self._view()
+        index = self._find(mm, header, fp)
+        if index is None:
+            return None
+        return self._entry(mm, header, index)
+
+    def at(self, created: int):
+        """
+        Last key created at or before `created` (nanoseconds since the epoch)
+
+        Returns:
+            KeyEntry, or None if every key is newer
+        """
+        mm, header = self._view()
+        low, high = 0, header['count']
+        while low < high:
+            middle = (low + high) // 2
+            (entry_created,) = struct.unpack_from("<q", mm, header['entry_off'] + middle * ENTRY_SIZE + 32)
+            if entry_created <= created:
+                low = middle + 1
+            else:
+                high = middle
+        if low == 0:
+            return None
+        return self._entry(mm, header, low - 1)
+
+    def after(self, created: int, kind: int = None):
+        """
+        First key (of the given kind if one is given) created at or after
+        `created`. Keys stored with put_many() share their creation time, so
+        after(entry.created, kind) finds the key stored together with entry.
+
+        Returns:
+            KeyEntry, or None if no such key exists
+        """
+        mm, header = self._view()
+        low, high = 0, header['count']
+        while low < high:
+            middle = (low + high) // 2
+            (entry_created,) = struct.unpack_from("<q", mm, header['entry_off'] + middle * ENTRY_SIZE + 32)
+            if entry_created < created:
+                low = middle + 1
+            else:
+                high = middle
+        for index in range(low, header['count']):
+            if kind is None or self._entry_kind(mm, header, index) == kind:
+                return self._entry(mm, header, index)
+        return None
+
+    def __iter__(self):
+        mm, header = self._view()
+        for index in range(header['count']):
+            yield self._entry(mm, header, index)
+
+    # Writing
+
+    def _write(self, offset: int, data: bytes):
+        self._file.seek(offset)
+        self._file.write(data)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _insert_slot(self, header: dict, fp: bytes, index: int):
+        mask = header['slot_cap'] - 1
+        slot = int.from_bytes(fp[:8], "little") & mask
+        while True:
+            position = header['slot_off'] + slot * SLOT_SIZE
+            self._file.seek(position)
+            (value,) = _SLOT.unpack(self._file.read(SLOT_SIZE))
+            # Free slot, or one left by an interrupted append
+            if value == 0 or value - 1 >= header['count']:
+                self._write(position, _SLOT.pack(index + 1))
+                return
+            slot = (slot + 1) & mask
+
+    def _grow(self, header: dict):
+        """
+        Copy the entry table to the end of the file with double capacity and
+        rebuild the slot table next to it (not visible until the header is written)
+        """
+        count = header['count']
+        self._file.seek(header['entry_off'])
+        entries = self._file.read(count * ENTRY_SIZE)
+
+        entry_cap = 2 * header['entry_cap']
+        slot_cap = 2 * entry_cap
+        entry_off = header['end']
+        slot_off = entry_off + entry_cap * ENTRY_SIZE
+
+        slots = bytearray(slot_cap * SLOT_SIZE)
+        mask = slot_cap - 1
+        for index in range(count):
+            fp = entries[index * ENTRY_SIZE:index * ENTRY_SIZE + 32]
+            slot = int.from_bytes(fp[:8], "little") & mask
+            while _SLOT.unpack_from(slots, slot * SLOT_SIZE)[0]:
+                slot = (slot + 1) & mask
+            _SLOT.pack_into(slots, slot * SLOT_SIZE, index + 1)
+
+        self._write(entry_off, entries.ljust(entry_cap * ENTRY_SIZE, b"\0"))
+        self._write(slot_off, bytes(slots))
+
+        header.update(entry_off=entry_off, entry_cap=entry_cap, slot_off=slot_off, slot_cap=slot_cap,
+                      end=slot_off + slot_cap * SLOT_SIZE)
+
+    def put(self, kind: int, data: bytes, created: int = None) -> bytes:
+        """
+        Append a key to the store
+
+        Args:
+            kind: One of the KIND_* constants
+            data: Key bytes
+            created: Creation time in nanoseconds (default: now)
+
+        Returns:
+            fingerprint: SHA-256 of data. Storing the same bytes again does not
+            add a new entry, it makes the stored one the latest of its kind.
+
+        Raises:
+            ValueError: if the same bytes are already stored with another kind
+        """
+        return self.put_many([(kind, data)], created)[0]
+
+    def put_many(self, keys, created: int = None) -> list:
+        """
+        Append several keys in a single commit: after a crash either all of
+        them are in the store or none is. They share the same creation time,
+        so after() finds the keys stored together with a given one.
+
+        Args:
+            keys: (kind, data) pairs
+            created: Creation time in nanoseconds (default: now)
+
+        Returns:
+            fingerprints, in the order of keys (see put)
+        """
+        if self.readonly:
+            raise io.UnsupportedOperation(f"{self.path} was opened read-only")
+        header = self._read_header()
+        mm, _ = self._view()
+
+        # Check every key before writing anything
+        pending = []
+        kinds = {}  # fingerprint -> kind, for keys repeated within keys
+        for kind, data in keys:
+            if not 0 < kind < MAX_KINDS:
+                raise ValueError(f"Invalid key kind {kind}")
+            fp = fingerprint(data)
+            index = self._find(mm, header, fp)
+            stored_kind = self._entry_kind(mm, header, index) if index is not None else kinds.get(fp)
+            if stored_kind is not None and stored_kind != kind:
+                raise ValueError(f"Key {fp.hex()[:16]} is already stored with kind {stored_kind}")
+            kinds[fp] = kind
+            pending.append((kind, data, fp, index))
+
+        # Creation times increase from one commit to the next so at() can
+        # binary search and after() never mixes keys of different commits
+        if created is None:
+            created = time.time_ns()
+        if header['count']:
+            self._file.seek(header['entry_off'] + (header['count'] - 1) * ENTRY_SIZE + 32)
+            (last,) = struct.unpack("<q", self._file.read(8))
+            created = max(created, last + 1)
+
+        added = {}
+        for kind, data, fp, index in pending:
+            if index is None:
+                index = added.get(fp)
+            if index is None:
+                if header['count'] == header['entry_cap']:
+                    self._grow(header)
+                index = header['count']
+                offset = header['end']
+                self._write(offset, data)
+                self._write(header['entry_off'] + index * ENTRY_SIZE, _ENTRY.pack(fp, created, offset, len(data), kind))
+                self._insert_slot(header, fp, index)
+                # Not committed yet: the file header still has the old count
+                header['count'] = index + 1
+                header['end'] = offset + len(data)
+                added[fp] = index
+            header['latest'][kind] = index + 1
+        if added:
+            self._sync()
+
+        # Commit point
+        self._write(0, self._pack_header(header))
+        self._sync()
+        return [fp for _, _, fp, _ in pending]
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
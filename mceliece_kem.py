@@ -5,10 +5,37 @@ for educational purposes, designed to replace Kyber in the encryption project.
 """
 
 import os
+import mmap
+import struct
 import hashlib
 import numpy as np
 from typing import Tuple
 
+# Classic McEliece parameter sets (n, k, t), used with the packed key format
+PARAMETER_SETS = {
+    'mceliece348864': (3488, 2720, 64),
+    'mceliece460896': (4608, 3360, 96),
+    'mceliece6688128': (6688, 5024, 128),
+    'mceliece6960119': (6960, 5413, 119),
+    'mceliece8192128': (8192, 6528, 128),
+}
+
+# Packed key format: header (magic, n, k, t) followed by the k rows of P,
+# each packed to ceil((n-k)/8) bytes. The identity part of G = [I_k | P] is implicit.
+PACKED_PK_MAGIC = b"MCPK"
+PACKED_SK_MAGIC = b"MCSK"
+_PACKED_HEADER = struct.Struct("<4sIII")
+
+# Default working memory for the block-wise (packed) operations
+DEFAULT_MEMORY_BUDGET = 16 * 1024 * 1024
+
+
+def packed_key_size(n: int, k: int) -> int:
+    """
+    Size in bytes of a packed key for an (n, k) code
+    """
+    return _PACKED_HEADER.size + k * ((n - k + 7) // 8)
+
 class McEliece_KEM:
     """
     Simplified McEliece Key Encapsulation Mechanism
@@ -67,11 +94,15 @@ class McEliece_KEM:
         Encapsulate: Generate shared secret and ciphertext
 
         Args:
-            public_key: Public key bytes
+            public_key: Public key bytes, or a packed public key (bytes, buffer
+                or file path, see encaps_packed)
 
         Returns:
             (shared_secret, ciphertext): Tuple of 32-byte shared secret and ciphertext
         """
+        if self._is_packed(public_key, PACKED_PK_MAGIC):
+            return self.encaps_packed(public_key)
+
         # Deserialize public key
         pk = self._deserialize_key(public_key)
         G_pub = pk['G_pub']
@@ -113,12 +144,16 @@ class McEliece_KEM:
         Decapsulate: Recover shared secret from ciphertext
 
         Args:
-            private_key: Private key bytes
+            private_key: Private key bytes, or a packed private key (bytes,
+                buffer or file path, see decaps_packed)
             ciphertext: Ciphertext bytes
 
         Returns:
             shared_secret: 32-byte shared secret
         """
+        if self._is_packed(private_key, PACKED_SK_MAGIC):
+            return self.decaps_packed(private_key, ciphertext)
+
         # Deserialize private key and ciphertext
         sk = self._deserialize_key(private_key)
         c = np.frombuffer(ciphertext, dtype=np.uint8)
@@ -134,6 +169,198 @@ class McEliece_KEM:
 
         return shared_secret
 
+    def keygen_packed(self, public_out, private_out=None, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> int:
+        """
+        Memory-bounded key generation writing packed keys directly to their destination
+
+        The k x (n-k) matrix P is generated in row blocks that fit in memory_budget
+        bytes, and each block is written before the next one is generated, so peak
+        memory does not depend on the code size. Since G = [I_k | P] is already in
+        systematic form no reduction is needed and only P is stored.
+
+        Args:
+            public_out: File path or writable buffer (mmap, bytearray) for the public key
+            private_out: File path or writable buffer for the private key (optional)
+            memory_budget: Working memory in bytes
+
+        Returns:
+            Size in bytes of each packed key (see packed_key_size)
+        """
+        row_bytes = (self.n - self.k + 7) // 8
+        size = packed_key_size(self.n, self.k)
+        # randint needs a temporary as large as the block it returns
+        rows_per_block = self._rows_per_block(2 * row_bytes, memory_budget)
+
+        # Padding bits at the end of each row must stay at zero
+        pad_bits = 8 * row_bytes - (self.n - self.k)
+        last_byte_mask = (0xFF << pad_bits) & 0xFF
+
+        outputs = [self._open_packed_output(public_out, size)]
+        if private_out is not None:
+            outputs.append(self._open_packed_output(private_out, size))
+        try:
+            for (write, _), magic in zip(outputs, [PACKED_PK_MAGIC, PACKED_SK_MAGIC]):
+                write(_PACKED_HEADER.pack(magic, self.n, self.k, self.t))
+
+            for start in range(0, self.k, rows_per_block):
+                rows = min(rows_per_block, self.k - start)
+                # Uniform random bits are uniform random bytes, no need to build the 0/1 matrix
+                block = np.random.randint(0, 256, (rows, row_bytes), dtype=np.uint8)
+                block[:, -1] &= last_byte_mask
+                data = block.data.cast("B")  # no copy
+                for write, _ in outputs:
+                    write(data)
+        finally:
+            for _, close in outputs:
+                close()
+
+        return size
+
+    def encaps_packed(self, public_key, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Tuple[bytes, bytes]:
+        """
+        Encapsulate with a packed public key, reading P in row blocks
+
+        Args:
+            public_key: Packed public key (bytes, buffer or file path)
+            memory_budget: Working memory in bytes
+
+        Returns:
+            (shared_secret, ciphertext): Same format as encaps()
+        """
+        n, k, t, rows = self._load_packed_key(public_key, PACKED_PK_MAGIC)
+        m = np.random.randint(0, 2, k, dtype=np.uint8)
+
+        # Same error placement as encaps(): in the redundancy part first
+        e = np.zeros(n, dtype=np.uint8)
+        errors_in_redundancy = min(t, n - k)
+        errors_in_info = t - errors_in_redundancy
+        if errors_in_info > 0:
+            e[np.random.choice(k, errors_in_info, replace=False)] = 1
+        if errors_in_redundancy > 0:
+            e[np.random.choice(range(k, n), errors_in_redundancy, replace=False)] = 1
+
+        # c = m * [I_k | P] + e = [m | m * P] + e
+        c = np.concatenate([m, self._parity_packed(m, rows, n - k, memory_budget)])
+        c ^= e
+
+        shared_secret = hashlib.sha256(m.tobytes()).digest()
+        return shared_secret, c.tobytes()
+
+    def decaps_packed(self, private_key, ciphertext: bytes, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> bytes:
+        """
+        Decapsulate with a packed private key, reading P in row blocks
+
+        Args:
+            private_key: Packed private key (bytes, buffer or file path)
+            ciphertext: Ciphertext bytes
+            memory_budget: Working memory in bytes
+
+        Returns:
+            shared_secret: 32-byte shared secret
+        """
+        n, k, t, rows = self._load_packed_key(private_key, PACKED_SK_MAGIC)
+        c = np.frombuffer(ciphertext, dtype=np.uint8)
+        m_received = c[:k].copy()
+        parity_received = c[k:]
+
+        # Same decoding as _decode_simplified(), without building G
+        difference = self._parity_packed(m_received, rows, n - k, memory_budget) ^ parity_received
+        best_m = m_received
+        best_errors = int(difference.sum())
+
+        if best_errors > t:
+            # Flipping message bit i flips the parity by row i of P
+            for i in range(min(16, k)):
+                row = np.unpackbits(rows[i], count=n - k)
+                errors = int((difference ^ row).sum())
+                if errors < best_errors:
+                    best_m = m_received.copy()
+                    best_m[i] ^= 1
+                    best_errors = errors
+                    if errors == 0:
+                        break
+
+        return hashlib.sha256(best_m.tobytes()).digest()
+
+    def _parity_packed(self, m: np.ndarray, rows: np.ndarray, width: int, memory_budget: int) -> np.ndarray:
+        """
+        m * P (mod 2) with P given as packed rows, unpacking one block of rows at a time
+        """
+        parity = np.zeros(width, dtype=np.uint8)
+        # Unpacking needs a temporary as large as the unpacked block
+        rows_per_block = self._rows_per_block(2 * width, memory_budget)
+        for start in range(0, len(m), rows_per_block):
+            m_block = m[start:start + rows_per_block]
+            if not m_block.any():
+                continue
+            P_block = np.unpackbits(rows[start:start + rows_per_block], axis=1, count=width)
+            # uint8 overflow wraps modulo 256, which keeps the parity
+            parity ^= (m_block @ P_block) & 1
+        return parity
+
+    @staticmethod
+    def _rows_per_block(row_size: int, memory_budget: int) -> int:
+        return max(1, memory_budget // max(1, row_size))
+
+    @staticmethod
+    def _open_packed_output(target, size: int):
+        """
+        Return (write, close) functions writing sequentially to a file path or a buffer
+        """
+        if isinstance(target, (str, os.PathLike)):
+            f = open(target, "wb")
+            return f.write, f.close
+
+        view = memoryview(target).cast("B")
+        if len(view) < size:
+            raise ValueError(f"Buffer too small for the packed key ({len(view)} < {size} bytes)")
+        position = [0]
+
+        def write(data):
+            view[position[0]:position[0] + len(data)] = data
+            position[0] += len(data)
+
+        return write, view.release
+
+    @staticmethod
+    def _is_packed(key, magic: bytes) -> bool:
+        """
+        Whether key is a packed key. Only packed keys are stored as files, so
+        a file path always is one (its magic is checked when it is loaded).
+        """
+        if isinstance(key, (str, os.PathLike)):
+            return True
+        return bytes(key[:4]) == magic
+
+    @staticmethod
+    def _load_packed_key(key, magic: bytes):
+        """
+        Return (n, k, t, rows) for a packed key, rows being a k x ceil((n-k)/8)
+        uint8 view over the key. File paths are memory-mapped, not read.
+
+        Raises:
+            ValueError: if the key has another magic or is truncated
+        """
+        buffer = key
+        if isinstance(key, (str, os.PathLike)):
+            with open(key, "rb") as f:
+                # The map stays valid after the file is closed and is released with the view
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = memoryview(buffer).nbytes
+        if size < _PACKED_HEADER.size:
+            raise ValueError(f"Packed McEliece key too short ({size} bytes)")
+        key_magic, n, k, t = _PACKED_HEADER.unpack_from(buffer, 0)
+        if key_magic != magic:
+            raise ValueError("Not a packed McEliece key of the expected type")
+        if k > n:
+            raise ValueError(f"Invalid packed McEliece key header (n={n}, k={k})")
+        if size < packed_key_size(n, k):
+            raise ValueError(f"Truncated packed McEliece key ({size} bytes for n={n}, k={k})")
+        row_bytes = (n - k + 7) // 8
+        rows = np.frombuffer(buffer, dtype=np.uint8, count=k * row_bytes,
+                             offset=_PACKED_HEADER.size).reshape(k, row_bytes)
+        return n, k, t, rows
+
     def _decode_simplified(self, received: np.ndarray, G: np.ndarray) -> np.ndarray:
         """
         Simplified but efficient decoder using systematic form G = [I_k | P]
@@ -292,3 +519,70 @@ class ML_MCELIECE_1024_CLASS:
     def decaps(private_key, ciphertext):
         """Decapsulate to recover shared secret"""
         return ML_MCELIECE_1024.decaps(private_key, ciphertext)
+
+
+def benchmark_keygen(names=None, memory_budget: int = DEFAULT_MEMORY_BUDGET, dense: bool = False) -> list:
+    """
+    Peak memory and elapsed time of keygen for each parameter set
+
+    The packed keygen writes both keys to temporary files. Peak memory is the
+    largest amount of memory allocated during the call (tracemalloc, which
+    also follows numpy allocations).
+
+    Args:
+        names: Names from PARAMETER_SETS (default: all)
+        memory_budget: Working memory of the packed keygen in bytes
+        dense: Also measure the original keygen() (pickled dense matrices,
+            about 200 MB and several seconds for the largest sets)
+
+    Returns:
+        List of dictionaries, one per parameter set and mode
+    """
+    import tempfile
+    import time
+    import tracemalloc
+
+    # Warm up numpy so its one-time allocations are not counted in the first result
+    McEliece_KEM(n=16, k=8, t=1).keygen_packed(bytearray(packed_key_size(16, 8)))
+
+    results = []
+    for name in names or PARAMETER_SETS:
+        n, k, t = PARAMETER_SETS[name]
+        kem = McEliece_KEM(n=n, k=k, t=t)
+        modes = ['packed', 'dense'] if dense else ['packed']
+        with tempfile.TemporaryDirectory() as directory:
+            pk_path = os.path.join(directory, "pk.bin")
+            sk_path = os.path.join(directory, "sk.bin")
+            for mode in modes:
+                tracemalloc.start()
+                start = time.perf_counter()
+                if mode == 'packed':
+                    kem.keygen_packed(pk_path, sk_path, memory_budget)
+                    pk_size = os.path.getsize(pk_path)
+                else:
+                    pk, sk = kem.keygen()
+                    pk_size = len(pk)
+                    del pk, sk
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results.append({
+                    'name': name, 'mode': mode, 'n': n, 'k': k, 't': t,
+                    'public_key_bytes': pk_size, 'peak_bytes': peak, 'seconds': elapsed,
+                })
+    return results
+
+
+def print_keygen_benchmark(results: list) -> None:
+    """
+    Print the table returned by benchmark_keygen()
+    """
+    print(f"{'parameter set':18s} {'mode':7s} {'public key':>12s} {'peak memory':>12s} {'time':>10s}")
+    for r in results:
+        print(f"{r['name']:18s} {r['mode']:7s} {r['public_key_bytes'] / 2**20:9.2f} MB "
+              f"{r['peak_bytes'] / 2**20:9.2f} MB {1000 * r['seconds']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+    print_keygen_benchmark(benchmark_keygen(dense="--dense" in sys.argv[1:]))
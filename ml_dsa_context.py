@@ -0,0 +1,254 @@
+"""
+Prepared ML-DSA contexts for repeated operations with the same key.
+
+ML_DSA_44.verify(pk, m, sig) and ML_DSA_44.sign(sk, m) from dilithium_py
+decode the key and re-expand the public matrix A from its seed on every call.
+When the same key is used for many signatures (e.g. the gate that checks
+thousands of files against one verification key) that work is repeated for
+nothing. Verifier and Signer do it once and keep the NTT-domain values.
+"""
+
+import time
+from typing import Iterable, List, Tuple
+
+from dilithium_py import ml_dsa
+from dilithium_py.ml_dsa import ML_DSA_44
+
+
+def _format_message(m: bytes, ctx: bytes) -> bytes:
+    """
+    Build M' = 0 || len(ctx) || ctx || M as in FIPS 204 (Algorithms 2 and 3)
+    """
+    if len(ctx) > 255:
+        raise ValueError(
+            f"ctx bytes must have length at most 255, ctx has length {len(ctx)}"
+        )
+    return bytes([0]) + bytes([len(ctx)]) + ctx + m
+
+
+class Verifier:
+    """
+    ML-DSA verifier bound to one verification key
+
+    Precomputed on creation:
+    - A_hat: public matrix expanded from rho (NTT domain)
+    - t1_hat: t1 * 2^d (NTT domain)
+    - tr: H(pk) used to derive mu for each message
+    """
+
+    def __init__(self, public_key: bytes, scheme=ML_DSA_44):
+        self.scheme = scheme
+
+        # Raises ValueError if the key has the wrong length
+        rho, t1 = scheme._unpack_pk(public_key)
+
+        self.A_hat = scheme._expand_matrix_from_seed(rho)
+        self.t1_hat = t1.scale(1 << scheme.d).to_ntt()
+        self.tr = scheme._h(public_key, 64)
+
+    def verify(self, m: bytes, sig: bytes, ctx: bytes = b"") -> bool:
+        """
+        Verify a signature for message m (same result as scheme.verify(pk, m, sig, ctx))
+
+        Args:
+            m: Signed message bytes
+            sig: Signature bytes
+            ctx: Optional context string (at most 255 bytes)
+
+        Returns:
+            True if the signature is valid
+        """
+        s = self.scheme
+        m_prime = _format_message(m, ctx)
+
+        try:
+            c_tilde, z, h = s._unpack_sig(sig)
+        except ValueError:
+            return False
+
+        if h.sum_hint() > s.omega:
+            return False
+
+        if z.check_norm_bound(s.gamma_1 - s.beta):
+            return False
+
+        mu = s._h(self.tr + m_prime, 64)
+        c_hat = s.R.sample_in_ball(c_tilde, s.tau).to_ntt()
+        z_hat = z.to_ntt()
+
+        # Only the per-signature products are computed here, A_hat and t1_hat are reused
+        Az_minus_ct1 = ((self.A_hat @ z_hat) - self.t1_hat.scale(c_hat)).from_ntt()
+
+        w_prime = h.use_hint(Az_minus_ct1, 2 * s.gamma_2)
+        w_prime_bytes = w_prime.bit_pack_w(s.gamma_2)
+
+        return c_tilde == s._h(mu + w_prime_bytes, s.c_tilde_bytes)
+
+    def verify_many(self, items: Iterable[Tuple[bytes, bytes]], ctx: bytes = b"") -> List[bool]:
+        """
+        Verify a batch of (message, signature) pairs against this key
+
+        Returns:
+            List of booleans, one per pair, in the same order
+        """
+        return [self.verify(m, sig, ctx) for m, sig in items]
+
+
+class Signer:
+    """
+    ML-DSA signer bound to one signing key
+
+    Precomputed on creation:
+    - A_hat: public matrix expanded from rho (NTT domain)
+    - s1_hat, s2_hat, t0_hat: secret vectors (NTT domain)
+    - K, tr: seeds used to derive rho' and mu for each message
+    """
+
+    def __init__(self, private_key: bytes, scheme=ML_DSA_44):
+        self.scheme = scheme
+
+        # Raises ValueError if the key has the wrong length
+        rho, K, tr, s1, s2, t0 = scheme._unpack_sk(private_key)
+
+        self.K = K
+        self.tr = tr
+        self.A_hat = scheme._expand_matrix_from_seed(rho)
+        self.s1_hat = s1.to_ntt()
+        self.s2_hat = s2.to_ntt()
+        self.t0_hat = t0.to_ntt()
+
+    def sign(self, m: bytes, ctx: bytes = b"", deterministic: bool = False) -> bytes:
+        """
+        Sign message m (same output as scheme.sign(sk, m, ctx, deterministic))
+
+        Args:
+            m: Message bytes
+            ctx: Optional context string (at most 255 bytes)
+            deterministic: Use an all-zero rnd instead of fresh randomness
+
+        Returns:
+            signature: Signature bytes
+        """
+        s = self.scheme
+        m_prime = _format_message(m, ctx)
+
+        if deterministic:
+            rnd = bytes(32)
+        else:
+            rnd = s.random_bytes(32)
+
+        mu = s._h(self.tr + m_prime, 64)
+        rho_prime = s._h(self.K + rnd + mu, 64)
+
+        # Rejection sampling loop of Algorithm 7 (FIPS 204)
+        kappa = 0
+        alpha = s.gamma_2 << 1
+        while True:
+            y = s._expand_mask_vector(rho_prime, kappa)
+            w = (self.A_hat @ y.to_ntt()).from_ntt()
+            kappa += s.l
+
+            w1 = w.high_bits(alpha)
+            w1_bytes = w1.bit_pack_w(s.gamma_2)
+            c_tilde = s._h(mu + w1_bytes, s.c_tilde_bytes)
+            c_hat = s.R.sample_in_ball(c_tilde, s.tau).to_ntt()
+
+            z = y + self.s1_hat.scale(c_hat).from_ntt()
+            if z.check_norm_bound(s.gamma_1 - s.beta):
+                continue
+
+            c_s2 = self.s2_hat.scale(c_hat).from_ntt()
+            r0 = (w - c_s2).low_bits(alpha)
+            if r0.check_norm_bound(s.gamma_2 - s.beta):
+                continue
+
+            c_t0 = self.t0_hat.scale(c_hat).from_ntt()
+            if c_t0.check_norm_bound(s.gamma_2):
+                continue
+
+            h = (-c_t0).make_hint(w - c_s2 + c_t0, alpha)
+            if h.sum_hint() > s.omega:
+                continue
+
+            return s._pack_sig(c_tilde, z, h)
+
+    def sign_many(self, messages: Iterable[bytes], ctx: bytes = b"", deterministic: bool = False) -> List[bytes]:
+        """
+        Sign a batch of messages with this key
+
+        Returns:
+            List of signatures, one per message, in the same order
+        """
+        return [self.sign(m, ctx, deterministic) for m in messages]
+
+
+def scheme_name(scheme) -> str:
+    """
+    Name of a dilithium_py parameter set, e.g. "ML-DSA-44"
+    """
+    for name, value in vars(ml_dsa).items():
+        if value is scheme:
+            return name.replace("_", "-")
+    return "ML-DSA"
+
+
+def benchmark(n: int = 50, scheme=ML_DSA_44) -> dict:
+    """
+    Compare the stateless per-call path against the prepared contexts
+
+    Signs and verifies n random 32-byte messages (the size of the SHA-256
+    hashes that Signer.py/Authenticator.py use) with one key pair.
+
+    Returns:
+        Dictionary with the parameter set name and the elapsed seconds of each path
+    """
+    import os
+
+    pk, sk = scheme.keygen()
+    messages = [os.urandom(32) for _ in range(n)]
+
+    start = time.perf_counter()
+    signatures = [scheme.sign(sk, m) for m in messages]
+    sign_stateless = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Signer(sk, scheme).sign_many(messages)
+    sign_prepared = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stateless_ok = all(scheme.verify(pk, m, sig) for m, sig in zip(messages, signatures))
+    verify_stateless = time.perf_counter() - start
+
+    # Includes the cost of building the context once
+    start = time.perf_counter()
+    prepared_ok = all(Verifier(pk, scheme).verify_many(zip(messages, signatures)))
+    verify_prepared = time.perf_counter() - start
+
+    if not (stateless_ok and prepared_ok):
+        raise RuntimeError("Signature verification failed during benchmark")
+
+    return {
+        'scheme': scheme_name(scheme),
+        'n': n,
+        'sign_stateless': sign_stateless,
+        'sign_prepared': sign_prepared,
+        'verify_stateless': verify_stateless,
+        'verify_prepared': verify_prepared,
+    }
+
+
+def print_benchmark(results: dict) -> None:
+    """
+    Print the per-operation times returned by benchmark()
+    """
+    n = results['n']
+    print(f"{results['scheme']}, {n} messages")
+    for op in ('sign', 'verify'):
+        stateless = results[f'{op}_stateless']
+        prepared = results[f'{op}_prepared']
+        print(f"   {op:6s} stateless: {1000 * stateless / n:8.2f} ms/op")
+        print(f"   {op:6s} prepared:  {1000 * prepared / n:8.2f} ms/op  (x{stateless / prepared:.2f})")
+
+
+if __name__ == "__main__":
+    print_benchmark(benchmark())
@@ -0,0 +1,138 @@
+"""
+Performance regression tests for the McEliece KEM and the Hamming codec
+
+Only run with `pytest --bench`. Each sample repeats an operation for at least
+MIN_SAMPLE_TIME and is followed by a sample of a fixed reference workload
+(pure Python and small numpy operations, like the code under test). An
+operation's cost is the minimum of its REPEATS samples divided by the minimum
+of the reference samples: the minimum drops samples hit by scheduling noise,
+and the reference cancels slowdowns of the whole run (CPU frequency, other
+load), which a median over a second of samples does not. A test fails when
+that relative cost is more than THRESHOLD times its baseline. On an unchanged
+tree runs stay within about 5% of the baseline.
+
+Timings depend on the machine, so the baseline is not shared: record it with
+`pytest --update-baseline` (e.g. on the base commit in CI) before comparing.
+Without a baseline the benchmarks fail instead of silently passing.
+"""
+
+import json
+import os
+import platform
+import random
+import time
+
+import numpy as np
+import pytest
+
+from mceliece_kem import McEliece_KEM, ML_MCELIECE_1024_CLASS as ML_KEM, PARAMETER_SETS, packed_key_size
+from Task05 import encodeMessage, decodeMessage
+
+BASELINE_FILE = os.environ.get(
+    "BENCH_BASELINE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json"))
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "1.5"))
+REPEATS = 15
+MIN_SAMPLE_TIME = 0.05  # seconds
+HAMMING_MESSAGE_BYTES = 1024
+
+pytestmark = pytest.mark.bench
+
+
+def _batch_size(operation):
+    """Number of calls that takes at least MIN_SAMPLE_TIME"""
+    batch = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(batch):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_TIME:
+            return batch
+        batch = max(2 * batch, int(batch * 1.2 * MIN_SAMPLE_TIME / max(elapsed, 1e-9)))
+
+
+def _reference_workload():
+    x = 0
+    for i in range(20000):
+        x ^= i * 7 & 255
+    a = np.arange(64 * 192, dtype=np.uint8).reshape(64, 192) & 1
+    return x, (a.T @ a) % 2
+
+
+def _sample(operation, batch):
+    start = time.perf_counter()
+    for _ in range(batch):
+        operation()
+    return (time.perf_counter() - start) / batch
+
+
+def _relative_time(operation, reference_batch):
+    """
+    Returns:
+        (seconds per call, cost relative to the reference workload)
+    """
+    batch = _batch_size(operation)
+    samples, reference = [], []
+    for _ in range(REPEATS):
+        samples.append(_sample(operation, batch))
+        reference.append(_sample(_reference_workload, reference_batch))
+    return min(samples), min(samples) / min(reference)
+
+
+def _measure():
+    np.random.seed(0)
+    public_key, private_key = ML_KEM.keygen()
+    _, ciphertext = ML_KEM.encaps(public_key)
+
+    # Packed keygen of the largest code from the Task06 scripts
+    large = McEliece_KEM(*PARAMETER_SETS['mceliece6960119'])
+    large_key = bytearray(packed_key_size(large.n, large.k))
+
+    rng = random.Random(0)
+    message = "".join(chr(rng.randint(1, 255)) for _ in range(HAMMING_MESSAGE_BYTES))
+    blocks = encodeMessage(message)
+
+    operations = {
+        'keygen': ML_KEM.keygen,
+        'encaps': lambda: ML_KEM.encaps(public_key),
+        'decaps': lambda: ML_KEM.decaps(private_key, ciphertext),
+        'keygen_packed_6960119': lambda: large.keygen_packed(large_key),
+        # Per HAMMING_MESSAGE_BYTES bytes of message
+        'hamming_encode': lambda: encodeMessage(message),
+        'hamming_decode': lambda: decodeMessage([block.copy() for block in blocks]),
+    }
+    reference_batch = _batch_size(_reference_workload)
+    timings, relative = {}, {}
+    for name, operation in operations.items():
+        timings[name], relative[name] = _relative_time(operation, reference_batch)
+    return timings, relative
+
+
+@pytest.fixture(scope="module")
+def timings(request):
+    if request.config.getoption("--update-baseline"):
+        measured, relative = _measure()
+        with open(BASELINE_FILE, "w") as f:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(),
+                       'timings': measured, 'relative': relative}, f, indent=4)
+        pytest.skip(f"Baseline written to {BASELINE_FILE}")
+    if not os.path.exists(BASELINE_FILE):
+        pytest.fail(f"No benchmark baseline at {BASELINE_FILE}, record one with --update-baseline")
+    with open(BASELINE_FILE) as f:
+        baseline = json.load(f)
+    if 'relative' not in baseline:
+        pytest.fail(f"Benchmark baseline {BASELINE_FILE} has an old format, record it again with --update-baseline")
+    return _measure(), baseline
+
+
+@pytest.mark.parametrize("operation", ['keygen', 'encaps', 'decaps', 'keygen_packed_6960119',
+                                       'hamming_encode', 'hamming_decode'])
+def test_no_regression(timings, operation):
+    (measured, relative), baseline = timings
+    if operation not in baseline['relative']:
+        pytest.skip(f"No baseline for {operation}, run with --update-baseline")
+    ratio = relative[operation] / baseline['relative'][operation]
+    assert ratio <= THRESHOLD, (
+        f"{operation}: {1e3 * measured[operation]:.3f} ms vs baseline "
+        f"{1e3 * baseline['timings'][operation]:.3f} ms, relative to the reference workload "
+        f"x{ratio:.2f} > x{THRESHOLD}")
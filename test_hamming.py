@@ -0,0 +1,65 @@
+"""
+Round-trip tests for the Hamming(15,11) codec (Task05.py)
+"""
+
+import random
+
+import pytest
+
+from Task05 import hammingEncode, hammingDecode, encodeMessage, decodeMessage
+
+
+def _bits(value, length):
+    return [(value >> i) & 1 for i in range(length)]
+
+
+def test_every_block_roundtrip():
+    for value in range(2 ** 11):
+        block = _bits(value, 11)
+        assert hammingDecode(hammingEncode(block)) == block
+
+
+def test_every_single_error_corrected():
+    for value in range(2 ** 11):
+        block = _bits(value, 11)
+        encoded = hammingEncode(block)
+        for position in range(15):
+            received = encoded.copy()
+            received[position] ^= 1
+            assert hammingDecode(received) == block
+
+
+def test_codewords_have_zero_syndrome():
+    # Decoding a valid codeword must not change it
+    for value in range(2 ** 11):
+        encoded = hammingEncode(_bits(value, 11))
+        received = encoded.copy()
+        hammingDecode(received)
+        assert received == encoded
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_message_roundtrip_with_noise(seed):
+    rng = random.Random(seed)
+    message = "".join(chr(rng.randint(0, 255)) for _ in range(rng.randint(0, 64)))
+    blocks = encodeMessage(message)
+    assert all(len(block) == 15 for block in blocks)
+    for block in blocks:
+        block[rng.randrange(15)] ^= 1
+    assert decodeMessage(blocks, len(message)) == message
+
+
+@pytest.mark.parametrize("message", ["\x00", "a\x00", "ab\x00", "abc\x00", "\x00\x00\x00\x00", "a\x00b"])
+def test_nul_characters_kept(message):
+    assert decodeMessage(encodeMessage(message), len(message)) == message
+
+
+@pytest.mark.parametrize("message", ["", "a", "ab\x00", "Contraseña", "x" * 37])
+def test_padding_removed_without_length(message):
+    # Without the length only the padding is dropped; a trailing NUL is kept
+    # unless it fills the place where a padding byte could be
+    assert decodeMessage(encodeMessage(message)) == message
+
+
+def test_contrasena():
+    assert decodeMessage(encodeMessage("Contraseña")) == "Contraseña"
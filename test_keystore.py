@@ -0,0 +1,210 @@
+"""
+Tests for the indexed key store (keystore.py)
+"""
+
+import io
+import struct
+
+import pytest
+
+import keystore
+from keystore import (KeyStore, HEADER_SIZE, INITIAL_CAPACITY, SLOT_SIZE, KIND_KEM_CIPHERTEXT,
+                      KIND_KEM_PRIVATE, KIND_SIG_PUBLIC, KIND_SYMMETRIC, fingerprint)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "keys.pqks"
+
+
+def _used_slots(path):
+    data = path.read_bytes()
+    header = KeyStore._unpack_header(data)
+    slots = data[header['slot_off']:header['slot_off'] + header['slot_cap'] * SLOT_SIZE]
+    return sorted(value for (value,) in struct.iter_unpack("<Q", slots) if value)
+
+
+def test_put_get_latest_per_kind(path):
+    with KeyStore(path) as store:
+        assert len(store) == 0
+        assert store.latest() is None
+        assert store.latest(KIND_SYMMETRIC) is None
+
+        fp1 = store.put(KIND_SYMMETRIC, b"key 1")
+        fp2 = store.put(KIND_SIG_PUBLIC, b"pk")
+        fp3 = store.put(KIND_SYMMETRIC, b"key 2")
+        assert fp1 == fingerprint(b"key 1")
+        assert len(store) == 3
+
+        assert store.latest().data == b"key 2"
+        assert store.latest(KIND_SYMMETRIC).data == b"key 2"
+        assert store.latest(KIND_SIG_PUBLIC).data == b"pk"
+        assert store.latest(KIND_KEM_PRIVATE) is None
+
+        entry = store.get(fp2)
+        assert (entry.fingerprint, entry.kind, entry.data) == (fp2, KIND_SIG_PUBLIC, b"pk")
+        assert store.get(fp3).kind == KIND_SYMMETRIC
+        assert store.get(fingerprint(b"missing")) is None
+        assert [entry.data for entry in store] == [b"key 1", b"pk", b"key 2"]
+
+
+def test_invalid_kind_rejected(path):
+    with KeyStore(path) as store:
+        for kind in (0, keystore.MAX_KINDS):
+            with pytest.raises(ValueError):
+                store.put(kind, b"key")
+
+
+def test_put_again_makes_key_latest(path):
+    with KeyStore(path) as store:
+        store.put(KIND_SYMMETRIC, b"key 1")
+        store.put(KIND_SYMMETRIC, b"key 2")
+        assert store.put(KIND_SYMMETRIC, b"key 1") == fingerprint(b"key 1")
+        assert len(store) == 2
+        assert store.latest(KIND_SYMMETRIC).data == b"key 1"
+
+
+def test_put_same_bytes_other_kind_rejected(path):
+    with KeyStore(path) as store:
+        store.put(KIND_SYMMETRIC, b"key")
+        with pytest.raises(ValueError):
+            store.put(KIND_SIG_PUBLIC, b"key")
+        with pytest.raises(ValueError):
+            store.put_many([(KIND_KEM_PRIVATE, b"sk"), (KIND_KEM_CIPHERTEXT, b"sk")])
+        # Nothing was stored by the failed calls
+        assert len(store) == 1
+        assert store.latest(KIND_SIG_PUBLIC) is None
+        assert store.latest(KIND_KEM_PRIVATE) is None
+
+
+def test_at_binary_search(path):
+    with KeyStore(path) as store:
+        for i in range(100):
+            store.put(KIND_SYMMETRIC, b"key %d" % i, created=1000 + 10 * i)
+        assert store.at(999) is None
+        assert store.at(1000).data == b"key 0"
+        assert store.at(1005).data == b"key 0"
+        assert store.at(1010).data == b"key 1"
+        assert store.at(1000 + 10 * 57 + 9).data == b"key 57"
+        assert store.at(10 ** 18).data == b"key 99"
+
+
+def test_creation_times_increase(path):
+    with KeyStore(path) as store:
+        store.put(KIND_SYMMETRIC, b"key 1", created=5000)
+        store.put(KIND_SYMMETRIC, b"key 2", created=10)
+        times = [entry.created for entry in store]
+        assert times[0] == 5000 and times[1] > times[0]
+
+
+def test_put_many_after(path):
+    with KeyStore(path) as store:
+        store.put_many([(KIND_KEM_PRIVATE, b"sk 1"), (KIND_KEM_CIPHERTEXT, b"ct 1")])
+        store.put(KIND_SYMMETRIC, b"unrelated")
+        store.put(KIND_KEM_PRIVATE, b"sk 2")  # ciphertext never stored
+        store.put_many([(KIND_KEM_PRIVATE, b"sk 3"), (KIND_KEM_CIPHERTEXT, b"ct 3")])
+
+        entries = {entry.data: entry for entry in store}
+        assert entries[b"sk 1"].created == entries[b"ct 1"].created
+        assert store.after(entries[b"sk 1"].created, KIND_KEM_CIPHERTEXT).data == b"ct 1"
+        assert store.after(entries[b"sk 2"].created, KIND_KEM_CIPHERTEXT).data == b"ct 3"
+        assert store.after(entries[b"sk 2"].created).data == b"sk 2"
+        assert store.after(entries[b"sk 3"].created + 1) is None
+
+        private = store.latest(KIND_KEM_PRIVATE)
+        assert private.data == b"sk 3"
+        assert store.after(private.created, KIND_KEM_CIPHERTEXT).created == private.created
+
+
+def test_reopen(path):
+    with KeyStore(path) as store:
+        fp = store.put(KIND_SIG_PUBLIC, b"pk")
+        store.put(KIND_SYMMETRIC, b"key")
+    with KeyStore(path) as store:
+        assert len(store) == 2
+        assert store.get(fp).data == b"pk"
+        assert store.latest(KIND_SYMMETRIC).data == b"key"
+        store.put(KIND_SYMMETRIC, b"key 2")
+    with KeyStore(path, readonly=True) as store:
+        assert [entry.data for entry in store] == [b"pk", b"key", b"key 2"]
+        with pytest.raises(io.UnsupportedOperation):
+            store.put(KIND_SYMMETRIC, b"key 3")
+
+
+def test_readonly_missing_file(path):
+    with pytest.raises(FileNotFoundError):
+        KeyStore(path, readonly=True)
+    assert not path.exists()
+
+
+def test_growth_past_initial_capacity(path):
+    count = 4 * INITIAL_CAPACITY + 3
+    keys = [b"key %d" % i for i in range(count)]
+    with KeyStore(path) as store:
+        fps = [store.put(KIND_SYMMETRIC, key) for key in keys]
+        # The store is read while it grows
+        assert store.get(fps[0]).data == keys[0]
+    with KeyStore(path) as store:
+        assert len(store) == count
+        header = store._read_header()
+        assert header['entry_cap'] >= count
+        assert header['slot_cap'] == 2 * header['entry_cap']
+        for fp, key in zip(fps, keys):
+            assert store.get(fp).data == key
+        assert store.latest(KIND_SYMMETRIC).data == keys[-1]
+    assert _used_slots(path) == list(range(1, count + 1))
+
+
+def test_interrupted_put_leaves_stale_slot(path, monkeypatch):
+    with KeyStore(path) as store:
+        store.put(KIND_SYMMETRIC, b"key 1")
+
+    # Crash right before the header write: data, entry and slot are on disk
+    write = KeyStore._write
+
+    def crash_on_commit(self, offset, data):
+        if offset == 0:
+            raise OSError("crash")
+        write(self, offset, data)
+
+    store = KeyStore(path)
+    monkeypatch.setattr(KeyStore, "_write", crash_on_commit)
+    with pytest.raises(OSError):
+        store.put(KIND_SYMMETRIC, b"key 2")
+    monkeypatch.undo()
+    store.close()
+    assert _used_slots(path) == [1, 2]  # slot 2 points past count
+
+    with KeyStore(path) as store:
+        assert len(store) == 1
+        assert store.get(fingerprint(b"key 2")) is None
+        assert store.latest(KIND_SYMMETRIC).data == b"key 1"
+
+        # The stale slot is reused instead of leaving a second one behind
+        fp = store.put(KIND_SIG_PUBLIC, b"key 2")
+        assert store.get(fp).kind == KIND_SIG_PUBLIC
+    assert _used_slots(path) == [1, 2]
+
+
+def test_bad_magic_rejected(path):
+    KeyStore(path).close()
+    data = bytearray(path.read_bytes())
+    data[:4] = b"XXXX"
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        KeyStore(path)
+
+
+def test_bad_version_rejected(path):
+    KeyStore(path).close()
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<I", data, 4, keystore.VERSION + 1)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        KeyStore(path)
+
+
+def test_truncated_file_rejected(path):
+    path.write_bytes(b"PQKS" + bytes(HEADER_SIZE // 2))
+    with pytest.raises(ValueError):
+        KeyStore(path)
@@ -1,71 +1,163 @@
 """
-Test script for McEliece KEM implementation
+Tests for the McEliece KEM implementation (mceliece_kem.py)
+
+Property tests run keygen/encaps/decaps over random (n, k, t) parameter sets
+and seeds. The decapsulation failure rate is checked with enough cycles to
+bound it statistically: with no failure in N cycles the failure rate is below
+-ln(ALPHA) / N with confidence 1 - ALPHA ("rule of three" for ALPHA = 0.05).
 """
 
-from mceliece_kem import ML_MCELIECE_1024_CLASS as ML_KEM
+import math
+import random
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from mceliece_kem import (McEliece_KEM, ML_MCELIECE_1024_CLASS as ML_KEM, PACKED_PK_MAGIC,
+                          PARAMETER_SETS as CLASSIC_PARAMETER_SETS, packed_key_size)
+
+# Random parameter sets, t <= n - k so the simplified decoder can correct every error
+_rng = random.Random(2025)
+PARAMETER_SETS = []
+for _ in range(12):
+    k = _rng.randint(8, 160)
+    t = _rng.randint(1, 16)
+    n = k + _rng.randint(t, 96)
+    PARAMETER_SETS.append((n, k, t))
+PARAMETER_SETS.append((192, 128, 8))  # ML_MCELIECE_1024
 
-print("Testing McEliece KEM Implementation")
-print("=" * 50)
+SEEDS = [0, 1, 7, 42, 1234]
 
-# Test 1: Key Generation
-print("\n1. Testing key generation...")
-try:
+# Decapsulation failure rate bound
+ALPHA = 0.05
+MAX_FAILURE_RATE = 0.01
+FAILURE_TRIALS = math.ceil(-math.log(ALPHA) / MAX_FAILURE_RATE)
+
+
+def test_key_and_ciphertext_sizes():
     public_key, private_key = ML_KEM.keygen()
-    print(f"   ✓ Public key size: {len(public_key)} bytes")
-    print(f"   ✓ Private key size: {len(private_key)} bytes")
-except Exception as e:
-    print(f"   ✗ Error: {e}")
-    exit(1)
-
-# Test 2: Encapsulation
-print("\n2. Testing encapsulation...")
-try:
-    shared_secret1, ciphertext = ML_KEM.encaps(public_key)
-    print(f"   ✓ Shared secret size: {len(shared_secret1)} bytes")
-    print(f"   ✓ Ciphertext size: {len(ciphertext)} bytes")
-    print(f"   ✓ Shared secret (first 16 bytes): {shared_secret1[:16].hex()}")
-except Exception as e:
-    print(f"   ✗ Error: {e}")
-    exit(1)
-
-# Test 3: Decapsulation
-print("\n3. Testing decapsulation...")
-try:
-    shared_secret2 = ML_KEM.decaps(private_key, ciphertext)
-    print(f"   ✓ Recovered secret size: {len(shared_secret2)} bytes")
-    print(f"   ✓ Recovered secret (first 16 bytes): {shared_secret2[:16].hex()}")
-except Exception as e:
-    print(f"   ✗ Error: {e}")
-    exit(1)
-
-# Test 4: Verify shared secrets match
-print("\n4. Verifying shared secrets match...")
-if shared_secret1 == shared_secret2:
-    print("   ✓ SUCCESS! Shared secrets match perfectly!")
-else:
-    print("   ✗ FAILURE! Shared secrets do not match")
-    print(f"   Original:  {shared_secret1.hex()}")
-    print(f"   Recovered: {shared_secret2.hex()}")
-    exit(1)
-
-# Test 5: Multiple iterations
-print("\n5. Testing multiple encaps/decaps cycles...")
-success_count = 0
-total_tests = 10
-for i in range(total_tests):
-    pk, sk = ML_KEM.keygen()
-    secret1, ct = ML_KEM.encaps(pk)
-    secret2 = ML_KEM.decaps(sk, ct)
-    if secret1 == secret2:
-        success_count += 1
-
-print(f"   ✓ Success rate: {success_count}/{total_tests} ({100*success_count/total_tests:.1f}%)")
-
-if success_count == total_tests:
-    print("\n" + "=" * 50)
-    print("ALL TESTS PASSED! McEliece KEM is working correctly.")
-    print("=" * 50)
-else:
-    print("\n" + "=" * 50)
-    print(f"WARNING: Only {success_count}/{total_tests} tests passed.")
-    print("=" * 50)
+    shared_secret, ciphertext = ML_KEM.encaps(public_key)
+    assert len(shared_secret) == 32
+    assert len(ciphertext) == 192
+    assert len(ML_KEM.decaps(private_key, ciphertext)) == 32
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("n,k,t", PARAMETER_SETS)
+def test_roundtrip(n, k, t, seed):
+    np.random.seed(seed)
+    kem = McEliece_KEM(n=n, k=k, t=t)
+    public_key, private_key = kem.keygen()
+    shared_secret, ciphertext = kem.encaps(public_key)
+    assert len(ciphertext) == n
+    assert kem.decaps(private_key, ciphertext) == shared_secret
+
+
+@pytest.mark.parametrize("n,k,t", PARAMETER_SETS)
+def test_ciphertext_has_t_errors(n, k, t):
+    np.random.seed(n * k * t)
+    kem = McEliece_KEM(n=n, k=k, t=t)
+    public_key, private_key = kem.keygen()
+    G = kem._deserialize_key(public_key)['G_pub']
+    assert G.shape == (k, n)
+    assert np.array_equal(G[:, :k], np.eye(k, dtype=np.uint8))
+
+    _, ciphertext = kem.encaps(public_key)
+    c = np.frombuffer(ciphertext, dtype=np.uint8)
+    # Systematic code: the first k bits of c are m, so c - m * G is the error vector
+    e = (c + c[:k] @ G) % 2
+    assert int(e.sum()) == t
+
+
+def test_same_seed_same_keys():
+    kem = McEliece_KEM()
+    np.random.seed(3)
+    first = kem.keygen()
+    np.random.seed(3)
+    assert kem.keygen() == first
+
+
+def test_decapsulation_failure_rate():
+    np.random.seed(99)
+    failures = 0
+    public_key, private_key = ML_KEM.keygen()
+    for i in range(FAILURE_TRIALS):
+        if i % 50 == 0:
+            public_key, private_key = ML_KEM.keygen()
+        shared_secret, ciphertext = ML_KEM.encaps(public_key)
+        failures += ML_KEM.decaps(private_key, ciphertext) != shared_secret
+    assert failures == 0, f"{failures}/{FAILURE_TRIALS} decapsulation failures"
+
+
+@pytest.mark.parametrize("n,k,t", PARAMETER_SETS + [CLASSIC_PARAMETER_SETS['mceliece348864']])
+def test_packed_roundtrip(n, k, t, tmp_path):
+    np.random.seed(n + k + t)
+    kem = McEliece_KEM(n=n, k=k, t=t)
+    pk_path = tmp_path / "pk.bin"
+    sk_path = tmp_path / "sk.bin"
+    size = kem.keygen_packed(pk_path, sk_path, memory_budget=4096)
+    assert pk_path.stat().st_size == sk_path.stat().st_size == size == packed_key_size(n, k)
+
+    public_key = pk_path.read_bytes()
+    private_key = sk_path.read_bytes()
+    for _ in range(5):
+        shared_secret, ciphertext = kem.encaps(public_key)
+        assert len(ciphertext) == n
+        assert kem.decaps(private_key, ciphertext) == shared_secret
+        assert kem.decaps_packed(sk_path, ciphertext, memory_budget=1024) == shared_secret
+
+    # encaps()/decaps() dispatch on file paths and buffers too
+    for pk, sk in [(pk_path, sk_path), (str(pk_path), str(sk_path)),
+                   (bytearray(public_key), memoryview(private_key))]:
+        shared_secret, ciphertext = kem.encaps(pk)
+        assert kem.decaps(sk, ciphertext) == shared_secret
+
+
+@pytest.mark.parametrize("n,k,t", PARAMETER_SETS[:4])
+def test_packed_parity_matches_dense(n, k, t):
+    np.random.seed(k)
+    kem = McEliece_KEM(n=n, k=k, t=t)
+    public_key = bytearray(packed_key_size(n, k))
+    kem.keygen_packed(public_key)
+    _, _, _, rows = kem._load_packed_key(bytes(public_key), PACKED_PK_MAGIC)
+    P = np.unpackbits(rows, axis=1, count=n - k)
+    # Padding bits at the end of each row are zero
+    pad_bits = 8 * rows.shape[1] - (n - k)
+    assert not (rows[:, -1] & ((1 << pad_bits) - 1)).any()
+
+    m = np.random.randint(0, 2, k, dtype=np.uint8)
+    for budget in (1, 100, 10 ** 6):
+        assert np.array_equal(kem._parity_packed(m, rows, n - k, budget), (m.astype(np.int64) @ P) % 2)
+
+
+def test_truncated_packed_key_rejected(tmp_path):
+    kem = McEliece_KEM(n=64, k=32, t=4)
+    public_key = bytearray(packed_key_size(kem.n, kem.k))
+    private_key = bytearray(packed_key_size(kem.n, kem.k))
+    kem.keygen_packed(public_key, private_key)
+    _, ciphertext = kem.encaps(bytes(public_key))
+
+    for truncated in (b"MCSK", bytes(private_key[:16]), bytes(private_key[:-1])):
+        with pytest.raises(ValueError):
+            kem.decaps(truncated, ciphertext)
+    with pytest.raises(ValueError):
+        kem.encaps_packed(b"MCPK")
+    path = tmp_path / "pk.bin"
+    path.write_bytes(bytes(public_key[:-1]))
+    with pytest.raises(ValueError):
+        kem.encaps(path)
+
+
+def test_packed_keygen_memory_budget():
+    kem = McEliece_KEM(*CLASSIC_PARAMETER_SETS['mceliece6960119'])
+    public_key = bytearray(packed_key_size(kem.n, kem.k))
+    kem.keygen_packed(public_key, memory_budget=64 * 1024)  # warm up
+
+    budget = 256 * 1024
+    tracemalloc.start()
+    kem.keygen_packed(public_key, memory_budget=budget)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # The key itself is about 1 MB
+    assert peak < 1.5 * budget
@@ -0,0 +1,90 @@
+"""
+Tests pinning the prepared ML-DSA contexts (ml_dsa_context.py) to dilithium_py
+
+Verifier and Signer reimplement FIPS 204 Algorithms 7 and 8 on top of private
+dilithium_py helpers, so their output is compared with the library's own
+sign/verify for every parameter set we use.
+"""
+
+import os
+
+import pytest
+from dilithium_py.ml_dsa import ML_DSA_44, ML_DSA_65
+
+from ml_dsa_context import Signer, Verifier, benchmark
+
+
+@pytest.fixture(scope="module", params=[ML_DSA_44, ML_DSA_65], ids=["ML_DSA_44", "ML_DSA_65"])
+def keys(request):
+    scheme = request.param
+    pk, sk = scheme.keygen()
+    return scheme, pk, sk
+
+
+def test_deterministic_sign_matches_library(keys):
+    scheme, pk, sk = keys
+    signer = Signer(sk, scheme)
+    for ctx in (b"", b"context"):
+        m = os.urandom(32)
+        assert signer.sign(m, ctx, deterministic=True) == scheme.sign(sk, m, ctx, deterministic=True)
+
+
+def test_randomized_sign_verifies_with_library(keys):
+    scheme, pk, sk = keys
+    m = os.urandom(32)
+    assert scheme.verify(pk, m, Signer(sk, scheme).sign(m))
+
+
+def test_verify_matches_library(keys):
+    scheme, pk, sk = keys
+    verifier = Verifier(pk, scheme)
+    m = os.urandom(32)
+    sig = scheme.sign(sk, m)
+    assert verifier.verify(m, sig)
+    assert verifier.verify(m, sig) == scheme.verify(pk, m, sig)
+
+
+def test_verify_rejects_tampering(keys):
+    scheme, pk, sk = keys
+    verifier = Verifier(pk, scheme)
+    m = os.urandom(32)
+    sig = scheme.sign(sk, m, b"ctx")
+
+    tampered = bytes([m[0] ^ 1]) + m[1:]
+    assert not verifier.verify(tampered, sig, b"ctx")
+    assert not verifier.verify(m, sig[:-1], b"ctx")
+    assert not verifier.verify(m, sig)  # wrong context
+    flipped = bytes([sig[0] ^ 1]) + sig[1:]
+    assert not verifier.verify(m, flipped, b"ctx")
+
+
+def test_verify_many_keeps_order(keys):
+    scheme, pk, sk = keys
+    messages = [os.urandom(32) for _ in range(4)]
+    signatures = Signer(sk, scheme).sign_many(messages)
+    # Swap the last two signatures so only the first two pairs are valid
+    signatures[2], signatures[3] = signatures[3], signatures[2]
+    assert Verifier(pk, scheme).verify_many(zip(messages, signatures)) == [True, True, False, False]
+
+
+def test_oversized_ctx_rejected(keys):
+    scheme, pk, sk = keys
+    ctx = bytes(256)
+    with pytest.raises(ValueError):
+        Signer(sk, scheme).sign(b"m", ctx)
+    with pytest.raises(ValueError):
+        Verifier(pk, scheme).verify(b"m", bytes(scheme._sig_size()), ctx)
+
+
+def test_wrong_key_length_rejected():
+    with pytest.raises(ValueError):
+        Verifier(b"short")
+    with pytest.raises(ValueError):
+        Signer(b"short")
+
+
+def test_benchmark_names_scheme(keys):
+    scheme, pk, sk = keys
+    results = benchmark(2, scheme)
+    assert results['scheme'] == {ML_DSA_44: "ML-DSA-44", ML_DSA_65: "ML-DSA-65"}[scheme]
+    assert results['n'] == 2